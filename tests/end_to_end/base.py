@@ -17,6 +17,8 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+import concurrent.futures
+import json
 import logging
 import os
 import signal
@@ -25,6 +27,8 @@ import tempfile
 import time
 import unittest
 
+import requests
+
 from click.testing import CliRunner
 from testcontainers.redis import RedisContainer
 from testcontainers.mysql import MySqlContainer
@@ -34,6 +38,8 @@ from testcontainers.core.waiting_utils import wait_for_logs
 from trustable_cli.cli import trustable_grimoirelab_score
 
 GRIMOIRELAB_URL = "http://localhost:8000"
+GRIMOIRELAB_STARTUP_TIMEOUT = 60
+WORKERS_SHUTDOWN_TIMEOUT = 20
 
 
 class EndToEndTestCase(unittest.TestCase):
@@ -48,11 +54,22 @@ class EndToEndTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         logging.getLogger().handlers = []
-        cls.temp_file = tempfile.NamedTemporaryFile(delete=False)
+        # Write the reports to memory-backed storage when it is available
+        temp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        cls.temp_file = tempfile.NamedTemporaryFile(dir=temp_dir, suffix=".json", delete=False)
         cls.runner = CliRunner()
-        cls._start_redis_container(cls)
-        cls._start_database_container(cls)
-        cls._start_opensearch_container(cls)
+        # Containers don't depend on each other; start them at the same time
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            containers = [
+                executor.submit(start_container, cls)
+                for start_container in (
+                    cls._start_redis_container,
+                    cls._start_database_container,
+                    cls._start_opensearch_container,
+                )
+            ]
+            for container in containers:
+                container.result()
         cls._start_grimoirelab(cls)
         cls._preload_repositories(cls)
 
@@ -60,11 +77,16 @@ class EndToEndTestCase(unittest.TestCase):
     def tearDownClass(cls):
         cls.grimoirelab_eventizers.terminate()
         cls.grimoirelab_archivists.terminate()
-        time.sleep(20)
+        for workers in (cls.grimoirelab_eventizers, cls.grimoirelab_archivists):
+            try:
+                workers.wait(timeout=WORKERS_SHUTDOWN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                workers.kill()
         cls.grimoirelab_server.send_signal(signal.SIGINT)
         cls.mysql_container.stop()
         cls.opensearch_container.stop()
         cls.redis_container.stop()
+        os.unlink(cls.temp_file.name)
 
     def _start_database_container(self):
         self.mysql_container = MySqlContainer(image="mariadb:latest", root_password="root").with_exposed_ports(3306)
@@ -113,13 +135,33 @@ class EndToEndTestCase(unittest.TestCase):
             stderr=subprocess.DEVNULL,
             start_new_session=True,
         )
-        time.sleep(10)
+        self._wait_for_grimoirelab(self)
+
+    def _wait_for_grimoirelab(self):
+        """Wait until the GrimoireLab server accepts connections"""
+
+        deadline = time.monotonic() + GRIMOIRELAB_STARTUP_TIMEOUT
+        while True:
+            try:
+                requests.get(GRIMOIRELAB_URL, timeout=1)
+                return
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
 
     def _preload_repositories(self):
-        self.runner.invoke(
+        self._run_cli("./data/archived_repos.spdx.xml", "--from-date=2000-01-01")
+        time.sleep(20)
+
+    @classmethod
+    def _run_cli(cls, filename, *args):
+        """Run the CLI against the test servers, writing the report to the temporary file"""
+
+        return cls.runner.invoke(
             trustable_grimoirelab_score,
             [
-                "./data/archived_repos.spdx.xml",
+                filename,
                 "--grimoirelab-url",
                 GRIMOIRELAB_URL,
                 "--grimoirelab-user",
@@ -127,12 +169,17 @@ class EndToEndTestCase(unittest.TestCase):
                 "--grimoirelab-password",
                 "admin",
                 "--opensearch-url",
-                self.opensearch_url,
+                cls.opensearch_url,
                 "--opensearch-index",
                 "events",
                 "--output",
-                self.temp_file.name,
-                "--from-date=2000-01-01",
+                cls.temp_file.name,
+                *args,
             ],
         )
-        time.sleep(20)
+
+    def _read_metrics(self):
+        """Load the report written by the last CLI run"""
+
+        with open(self.temp_file.name) as f:
+            return json.load(f)
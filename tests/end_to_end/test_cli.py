@@ -16,393 +16,262 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
-import json
 import logging
+import math
 import unittest
 
-from trustable_cli.cli import trustable_grimoirelab_score
 from end_to_end.base import EndToEndTestCase
 
-GRIMOIRELAB_URL = "http://localhost:8000"
+# Float metrics, compared with a relative tolerance
+APPROX_METRICS = ("message_size_mean", "commits_per_week", "commits_per_month", "commits_per_year")
+APPROX_REL_TOL = 1e-9
+
+# From 2000 to 2025 there are 9132 days
+QUICKSTART_METRICS_2000_2025 = {
+    "total_commits": 164,
+    "total_contributors": 25,
+    "pony_factor": 2,
+    "elephant_factor": 2,
+    "file_types_other": 683,
+    "file_types_binary": 0,
+    "file_types_code": 479,
+    "commit_size_added_lines": 53121,
+    "commit_size_removed_lines": 51852,
+    "message_size_total": 9778,
+    "message_size_mean": 9778 / 164,
+    "message_size_median": 46,
+    "developer_categories_core": 3,
+    "developer_categories_regular": 13,
+    "developer_categories_casual": 9,
+    "commits_per_week": 164 / (9132 / 7),
+    "commits_per_month": 164 / (9132 / 30),
+    "commits_per_year": 164 / (9132 / 365),
+}
+
+ANGULAR_SEED_METRICS_2000_2025 = {
+    "total_commits": 207,
+    "total_contributors": 58,
+    "pony_factor": 5,
+    "elephant_factor": 2,
+    "file_types_other": 534,
+    "file_types_binary": 4,
+    "file_types_code": 2129,
+    "commit_size_added_lines": 218483,
+    "commit_size_removed_lines": 245784,
+    "message_size_total": 15488,
+    "message_size_mean": 15488 / 207,
+    "message_size_median": 45,
+    "developer_categories_core": 16,
+    "developer_categories_regular": 31,
+    "developer_categories_casual": 11,
+    "commits_per_week": 207 / (9132 / 7),
+    "commits_per_month": 207 / (9132 / 30),
+    "commits_per_year": 207 / (9132 / 365),
+}
+
+# From 2017 to 2025 there are 2922 days
+QUICKSTART_METRICS_2017_2025 = {
+    "total_commits": 22,
+    "total_contributors": 8,
+    "pony_factor": 2,
+    "elephant_factor": 1,
+    "file_types_other": 37,
+    "file_types_binary": 0,
+    "file_types_code": 17,
+    "commit_size_added_lines": 269,
+    "commit_size_removed_lines": 103,
+    "message_size_total": 1866,
+    "message_size_mean": 1866 / 22,
+    "message_size_median": 57,
+    "developer_categories_core": 3,
+    "developer_categories_regular": 3,
+    "developer_categories_casual": 2,
+    "commits_per_week": 22 / (2922 / 7),
+    "commits_per_month": 22 / (2922 / 30),
+    "commits_per_year": 22 / (2922 / 365),
+}
+
+ANGULAR_SEED_METRICS_2017_2025 = {
+    "total_commits": 11,
+    "total_contributors": 4,
+    "pony_factor": 1,
+    "elephant_factor": 1,
+    "file_types_other": 24,
+    "file_types_binary": 0,
+    "file_types_code": 13,
+    "commit_size_added_lines": 4849,
+    "commit_size_removed_lines": 149,
+    "message_size_total": 911,
+    "message_size_mean": 911 / 11,
+    "message_size_median": 56,
+    "developer_categories_core": 1,
+    "developer_categories_regular": 2,
+    "developer_categories_casual": 1,
+    "commits_per_week": 11 / (2922 / 7),
+    "commits_per_month": 11 / (2922 / 30),
+    "commits_per_year": 11 / (2922 / 365),
+}
+
+# From 2000 to 2017 there are 6210 days
+QUICKSTART_METRICS_2000_2017 = {
+    "total_commits": 142,
+    "total_contributors": 20,
+    "pony_factor": 2,
+    "elephant_factor": 2,
+    "file_types_other": 646,
+    "file_types_binary": 0,
+    "file_types_code": 462,
+    "commit_size_added_lines": 52852,
+    "commit_size_removed_lines": 51749,
+    "message_size_total": 7912,
+    "message_size_mean": 7912 / 142,
+    "message_size_median": 44,
+    "developer_categories_core": 3,
+    "developer_categories_regular": 9,
+    "developer_categories_casual": 8,
+    "commits_per_week": 142 / (6210 / 7),
+    "commits_per_month": 142 / (6210 / 30),
+    "commits_per_year": 142 / (6210 / 365),
+}
+
+ANGULAR_SEED_METRICS_2000_2017 = {
+    "total_commits": 196,
+    "total_contributors": 56,
+    "pony_factor": 5,
+    "elephant_factor": 2,
+    "file_types_other": 510,
+    "file_types_binary": 4,
+    "file_types_code": 2116,
+    "commit_size_added_lines": 213634,
+    "commit_size_removed_lines": 245635,
+    "message_size_total": 14577,
+    "message_size_mean": 14577 / 196,
+    "message_size_median": 45,
+    "developer_categories_core": 16,
+    "developer_categories_regular": 30,
+    "developer_categories_casual": 10,
+    "commits_per_week": 196 / (6210 / 7),
+    "commits_per_month": 196 / (6210 / 30),
+    "commits_per_year": 196 / (6210 / 365),
+}
+
+# Date ranges checked on the archived repositories and their expected metrics
+DATE_RANGES = [
+    ("2000-01-01", "2025-01-01", QUICKSTART_METRICS_2000_2025, ANGULAR_SEED_METRICS_2000_2025),
+    ("2017-01-01", "2025-01-01", QUICKSTART_METRICS_2017_2025, ANGULAR_SEED_METRICS_2017_2025),
+    ("2000-01-01", "2017-01-01", QUICKSTART_METRICS_2000_2017, ANGULAR_SEED_METRICS_2000_2017),
+]
 
 
 class TestMetrics(EndToEndTestCase):
     """End to end tests for Trustable CLI metrics"""
 
-    def test_metrics(self):
-        """Check whether the metrics are correctly calculated"""
+    def assertMetrics(self, metrics, expected):
+        """Check the metrics of a repository, allowing rounding errors on float values"""
 
-        with self.assertLogs(logging.getLogger()) as logger:
-            result = self.runner.invoke(
-                trustable_grimoirelab_score,
-                [
-                    "./data/archived_repos.spdx.xml",
-                    "--grimoirelab-url",
-                    GRIMOIRELAB_URL,
-                    "--grimoirelab-user",
-                    "admin",
-                    "--grimoirelab-password",
-                    "admin",
-                    "--opensearch-url",
-                    self.opensearch_url,
-                    "--opensearch-index",
-                    "events",
-                    "--output",
-                    self.temp_file.name,
-                    "--from-date=2000-01-01",
-                    "--to-date=2025-01-01",
-                ],
+        exact = {name: value for name, value in metrics.items() if name not in APPROX_METRICS}
+        expected_exact = {name: value for name, value in expected.items() if name not in APPROX_METRICS}
+        self.assertEqual(exact, expected_exact)
+
+        for name in APPROX_METRICS:
+            self.assertTrue(
+                math.isclose(metrics[name], expected[name], rel_tol=APPROX_REL_TOL),
+                f"{name}: {metrics[name]} != {expected[name]}",
             )
-            self.assertEqual(result.exit_code, 0)
-            # Check logs
-            self.assertIn("INFO:root:Parsing file ./data/archived_repos.spdx.xml", logger.output)
-            self.assertIn("INFO:root:Found 2 git repositories", logger.output)
-            self.assertIn("INFO:root:Scheduling tasks", logger.output)
-            self.assertIn("INFO:root:Generating metrics", logger.output)
 
-            # Check metrics
-            with open(self.temp_file.name) as f:
-                metrics = json.load(f)
-                self.assertEqual(len(metrics["packages"]), 2)
+    def assertPackage(self, metrics, package, repository, expected):
+        """Check the repository and metrics reported for a package"""
 
-                self.assertIn("SPDXRef-angular", metrics["packages"])
-                self.assertEqual(metrics["packages"]["SPDXRef-angular"]["repository"], "https://github.com/angular/quickstart")
-                quickstart_metrics = metrics["packages"]["SPDXRef-angular"]["metrics"]
-                self.assertEqual(quickstart_metrics["total_commits"], 164)
-                self.assertEqual(quickstart_metrics["total_contributors"], 25)
-                self.assertEqual(quickstart_metrics["pony_factor"], 2)
-                self.assertEqual(quickstart_metrics["elephant_factor"], 2)
-                self.assertEqual(quickstart_metrics["file_types_other"], 683)
-                self.assertEqual(quickstart_metrics["file_types_binary"], 0)
-                self.assertEqual(quickstart_metrics["file_types_code"], 479)
-                self.assertEqual(quickstart_metrics["commit_size_added_lines"], 53121)
-                self.assertEqual(quickstart_metrics["commit_size_removed_lines"], 51852)
-                self.assertEqual(quickstart_metrics["message_size_total"], 9778)
-                self.assertAlmostEqual(quickstart_metrics["message_size_mean"], 59.6219, delta=0.1)
-                self.assertEqual(quickstart_metrics["message_size_median"], 46)
-                self.assertEqual(quickstart_metrics["developer_categories_core"], 3)
-                self.assertEqual(quickstart_metrics["developer_categories_regular"], 13)
-                self.assertEqual(quickstart_metrics["developer_categories_casual"], 9)
-                # From 2000 to 2025 there are 9132 days
-                self.assertAlmostEqual(quickstart_metrics["commits_per_week"], 164 / (9132 / 7), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_month"], 164 / (9132 / 30), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_year"], 164 / (9132 / 365), delta=0.1)
-
-                self.assertIn("SPDXRef-angular-seed", metrics["packages"])
-                self.assertEqual(
-                    metrics["packages"]["SPDXRef-angular-seed"]["repository"], "https://github.com/angular/angular-seed"
-                )
-                angular_metrics = metrics["packages"]["SPDXRef-angular-seed"]["metrics"]
-                self.assertEqual(angular_metrics["total_commits"], 207)
-                self.assertEqual(angular_metrics["total_contributors"], 58)
-                self.assertEqual(angular_metrics["pony_factor"], 5)
-                self.assertEqual(angular_metrics["elephant_factor"], 2)
-                self.assertEqual(angular_metrics["file_types_other"], 534)
-                self.assertEqual(angular_metrics["file_types_binary"], 4)
-                self.assertEqual(angular_metrics["file_types_code"], 2129)
-                self.assertEqual(angular_metrics["commit_size_added_lines"], 218483)
-                self.assertEqual(angular_metrics["commit_size_removed_lines"], 245784)
-                self.assertEqual(angular_metrics["message_size_total"], 15488)
-                self.assertAlmostEqual(angular_metrics["message_size_mean"], 74.8212, delta=0.1)
-                self.assertEqual(angular_metrics["message_size_median"], 45)
-                self.assertEqual(angular_metrics["developer_categories_core"], 16)
-                self.assertEqual(angular_metrics["developer_categories_regular"], 31)
-                self.assertEqual(angular_metrics["developer_categories_casual"], 11)
-                # From 2000 to 2025 there are 9132 days
-                self.assertAlmostEqual(angular_metrics["commits_per_week"], 207 / (9132 / 7), delta=0.1)
-                self.assertAlmostEqual(angular_metrics["commits_per_month"], 207 / (9132 / 30), delta=0.1)
-                self.assertAlmostEqual(angular_metrics["commits_per_year"], 207 / (9132 / 365), delta=0.1)
-
-    def test_from_date(self):
-        """Check if it returns the number of commits of one repository from a particular date"""
+        with self.subTest(package=package):
+            self.assertIn(package, metrics["packages"])
+            self.assertEqual(metrics["packages"][package]["repository"], repository)
+            self.assertMetrics(metrics["packages"][package]["metrics"], expected)
 
-        with self.assertLogs(logging.getLogger()) as logger:
-            result = self.runner.invoke(
-                trustable_grimoirelab_score,
-                [
-                    "./data/archived_repos.spdx.xml",
-                    "--grimoirelab-url",
-                    GRIMOIRELAB_URL,
-                    "--grimoirelab-user",
-                    "admin",
-                    "--grimoirelab-password",
-                    "admin",
-                    "--opensearch-url",
-                    self.opensearch_url,
-                    "--opensearch-index",
-                    "events",
-                    "--output",
-                    self.temp_file.name,
-                    "--from-date=2017-01-01",
-                    "--to-date=2025-01-01",
-                ],
-            )
-            self.assertEqual(result.exit_code, 0)
-            # Check logs
-            self.assertIn("INFO:root:Parsing file ./data/archived_repos.spdx.xml", logger.output)
-            self.assertIn("INFO:root:Found 2 git repositories", logger.output)
-            self.assertIn("INFO:root:Scheduling tasks", logger.output)
-            self.assertIn("INFO:root:Generating metrics", logger.output)
+    def assertLogged(self, logger, expected):
+        """Check that every (level, message) pair in expected was logged"""
 
-            # Check metrics
-            with open(self.temp_file.name) as f:
-                metrics = json.load(f)
-                self.assertEqual(len(metrics["packages"]), 2)
+        logs = {(record.levelname, record.getMessage()) for record in logger.records}
+        missing = [entry for entry in expected if entry not in logs]
+        self.assertEqual(missing, [], "messages not logged")
 
-                self.assertIn("SPDXRef-angular", metrics["packages"])
-                self.assertEqual(metrics["packages"]["SPDXRef-angular"]["repository"], "https://github.com/angular/quickstart")
-                quickstart_metrics = metrics["packages"]["SPDXRef-angular"]["metrics"]
-                self.assertEqual(quickstart_metrics["total_commits"], 22)
-                self.assertEqual(quickstart_metrics["total_contributors"], 8)
-                self.assertEqual(quickstart_metrics["pony_factor"], 2)
-                self.assertEqual(quickstart_metrics["elephant_factor"], 1)
-                self.assertEqual(quickstart_metrics["file_types_other"], 37)
-                self.assertEqual(quickstart_metrics["file_types_binary"], 0)
-                self.assertEqual(quickstart_metrics["file_types_code"], 17)
-                self.assertEqual(quickstart_metrics["commit_size_added_lines"], 269)
-                self.assertEqual(quickstart_metrics["commit_size_removed_lines"], 103)
-                self.assertEqual(quickstart_metrics["message_size_total"], 1866)
-                self.assertAlmostEqual(quickstart_metrics["message_size_mean"], 84.8181, delta=0.1)
-                self.assertEqual(quickstart_metrics["message_size_median"], 57)
-                self.assertEqual(quickstart_metrics["developer_categories_core"], 3)
-                self.assertEqual(quickstart_metrics["developer_categories_regular"], 3)
-                self.assertEqual(quickstart_metrics["developer_categories_casual"], 2)
-                # From 2017 to 2025 there are 2922 days
-                self.assertAlmostEqual(quickstart_metrics["commits_per_week"], 22 / (2922 / 7), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_month"], 22 / (2922 / 30), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_year"], 22 / (2922 / 365), delta=0.1)
-
-                self.assertIn("SPDXRef-angular-seed", metrics["packages"])
-                self.assertEqual(
-                    metrics["packages"]["SPDXRef-angular-seed"]["repository"], "https://github.com/angular/angular-seed"
-                )
-                angular_metrics = metrics["packages"]["SPDXRef-angular-seed"]["metrics"]
-                self.assertEqual(angular_metrics["total_commits"], 11)
-                self.assertEqual(angular_metrics["total_contributors"], 4)
-                self.assertEqual(angular_metrics["pony_factor"], 1)
-                self.assertEqual(angular_metrics["elephant_factor"], 1)
-                self.assertEqual(angular_metrics["file_types_other"], 24)
-                self.assertEqual(angular_metrics["file_types_binary"], 0)
-                self.assertEqual(angular_metrics["file_types_code"], 13)
-                self.assertEqual(angular_metrics["commit_size_added_lines"], 4849)
-                self.assertEqual(angular_metrics["commit_size_removed_lines"], 149)
-                self.assertEqual(angular_metrics["message_size_total"], 911)
-                self.assertAlmostEqual(angular_metrics["message_size_mean"], 82.8181, delta=0.1)
-                self.assertEqual(angular_metrics["message_size_median"], 56)
-                self.assertEqual(angular_metrics["developer_categories_core"], 1)
-                self.assertEqual(angular_metrics["developer_categories_regular"], 2)
-                self.assertEqual(angular_metrics["developer_categories_casual"], 1)
-                # From 2017 to 2025 there are 2922 days
-                self.assertAlmostEqual(angular_metrics["commits_per_week"], 11 / (2922 / 7), delta=0.1)
-                self.assertAlmostEqual(angular_metrics["commits_per_month"], 11 / (2922 / 30), delta=0.1)
-                self.assertAlmostEqual(angular_metrics["commits_per_year"], 11 / (2922 / 365), delta=0.1)
-
-    def test_to_date(self):
-        """Check if it returns the number of commits of one repository up to a particular date"""
+    def test_metrics(self):
+        """Check whether the metrics are correctly calculated for each date range"""
 
-        with self.assertLogs(logging.getLogger()) as logger:
-            result = self.runner.invoke(
-                trustable_grimoirelab_score,
-                [
-                    "./data/archived_repos.spdx.xml",
-                    "--grimoirelab-url",
-                    GRIMOIRELAB_URL,
-                    "--grimoirelab-user",
-                    "admin",
-                    "--grimoirelab-password",
-                    "admin",
-                    "--opensearch-url",
-                    self.opensearch_url,
-                    "--opensearch-index",
-                    "events",
-                    "--output",
-                    self.temp_file.name,
-                    "--from-date=2000-01-01",
-                    "--to-date=2017-01-01",
-                ],
-            )
-            self.assertEqual(result.exit_code, 0)
-            # Check logs
-            self.assertIn("INFO:root:Parsing file ./data/archived_repos.spdx.xml", logger.output)
-            self.assertIn("INFO:root:Found 2 git repositories", logger.output)
-            self.assertIn("INFO:root:Scheduling tasks", logger.output)
-            self.assertIn("INFO:root:Generating metrics", logger.output)
+        for from_date, to_date, quickstart_expected, angular_seed_expected in DATE_RANGES:
+            with self.subTest(from_date=from_date, to_date=to_date), self.assertLogs(logging.getLogger()) as logger:
+                result = self._run_cli("./data/archived_repos.spdx.xml", f"--from-date={from_date}", f"--to-date={to_date}")
+                self.assertEqual(result.exit_code, 0)
+                # Check logs
+                self.assertLogged(
+                    logger,
+                    [
+                        ("INFO", "Parsing file ./data/archived_repos.spdx.xml"),
+                        ("INFO", "Found 2 git repositories"),
+                        ("INFO", "Scheduling tasks"),
+                        ("INFO", "Generating metrics"),
+                    ],
+                )
 
-            # Check metrics
-            with open(self.temp_file.name) as f:
-                metrics = json.load(f)
+                # Check metrics
+                metrics = self._read_metrics()
                 self.assertEqual(len(metrics["packages"]), 2)
 
-                self.assertIn("SPDXRef-angular", metrics["packages"])
-                self.assertEqual(metrics["packages"]["SPDXRef-angular"]["repository"], "https://github.com/angular/quickstart")
-                quickstart_metrics = metrics["packages"]["SPDXRef-angular"]["metrics"]
-                self.assertEqual(quickstart_metrics["total_commits"], 142)
-                self.assertEqual(quickstart_metrics["total_contributors"], 20)
-                self.assertEqual(quickstart_metrics["pony_factor"], 2)
-                self.assertEqual(quickstart_metrics["elephant_factor"], 2)
-                self.assertEqual(quickstart_metrics["file_types_other"], 646)
-                self.assertEqual(quickstart_metrics["file_types_binary"], 0)
-                self.assertEqual(quickstart_metrics["file_types_code"], 462)
-                self.assertEqual(quickstart_metrics["commit_size_added_lines"], 52852)
-                self.assertEqual(quickstart_metrics["commit_size_removed_lines"], 51749)
-                self.assertEqual(quickstart_metrics["message_size_total"], 7912)
-                self.assertAlmostEqual(quickstart_metrics["message_size_mean"], 55.71830985915493, delta=0.1)
-                self.assertEqual(quickstart_metrics["message_size_median"], 44)
-                self.assertEqual(quickstart_metrics["developer_categories_core"], 3)
-                self.assertEqual(quickstart_metrics["developer_categories_regular"], 9)
-                self.assertEqual(quickstart_metrics["developer_categories_casual"], 8)
-                # From 2000 to 2017 there are 6210 days
-                self.assertAlmostEqual(quickstart_metrics["commits_per_week"], 142 / (6210 / 7), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_month"], 142 / (6210 / 30), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_year"], 142 / (6210 / 365), delta=0.1)
-
-                self.assertIn("SPDXRef-angular-seed", metrics["packages"])
-                self.assertEqual(
-                    metrics["packages"]["SPDXRef-angular-seed"]["repository"], "https://github.com/angular/angular-seed"
+                self.assertPackage(metrics, "SPDXRef-angular", "https://github.com/angular/quickstart", quickstart_expected)
+                self.assertPackage(
+                    metrics, "SPDXRef-angular-seed", "https://github.com/angular/angular-seed", angular_seed_expected
                 )
-                angular_metrics = metrics["packages"]["SPDXRef-angular-seed"]["metrics"]
-                self.assertEqual(angular_metrics["total_commits"], 196)
-                self.assertEqual(angular_metrics["total_contributors"], 56)
-                self.assertEqual(angular_metrics["pony_factor"], 5)
-                self.assertEqual(angular_metrics["elephant_factor"], 2)
-                self.assertEqual(angular_metrics["file_types_other"], 510)
-                self.assertEqual(angular_metrics["file_types_binary"], 4)
-                self.assertEqual(angular_metrics["file_types_code"], 2116)
-                self.assertEqual(angular_metrics["commit_size_added_lines"], 213634)
-                self.assertEqual(angular_metrics["commit_size_removed_lines"], 245635)
-                self.assertEqual(angular_metrics["message_size_total"], 14577)
-                self.assertAlmostEqual(angular_metrics["message_size_mean"], 74.37244897959184, delta=0.1)
-                self.assertEqual(angular_metrics["message_size_median"], 45)
-                self.assertEqual(angular_metrics["developer_categories_core"], 16)
-                self.assertEqual(angular_metrics["developer_categories_regular"], 30)
-                self.assertEqual(angular_metrics["developer_categories_casual"], 10)
-                # From 2000 to 2017 there are 6210 days
-                self.assertAlmostEqual(angular_metrics["commits_per_week"], 196 / (6210 / 7), delta=0.1)
-                self.assertAlmostEqual(angular_metrics["commits_per_month"], 196 / (6210 / 30), delta=0.1)
-                self.assertAlmostEqual(angular_metrics["commits_per_year"], 196 / (6210 / 365), delta=0.1)
 
     def test_duplicate_repo(self):
         """Check if it ignores duplicated URLs"""
 
         with self.assertLogs(logging.getLogger()) as logger:
-            result = self.runner.invoke(
-                trustable_grimoirelab_score,
+            result = self._run_cli("./data/duplicate_repo.spdx.xml", "--from-date=2000-01-01", "--to-date=2025-01-01")
+            self.assertEqual(result.exit_code, 0)
+            # Check logs
+            self.assertLogged(
+                logger,
                 [
-                    "./data/duplicate_repo.spdx.xml",
-                    "--grimoirelab-url",
-                    GRIMOIRELAB_URL,
-                    "--grimoirelab-user",
-                    "admin",
-                    "--grimoirelab-password",
-                    "admin",
-                    "--opensearch-url",
-                    self.opensearch_url,
-                    "--opensearch-index",
-                    "events",
-                    "--output",
-                    self.temp_file.name,
-                    "--from-date=2000-01-01",
-                    "--to-date=2025-01-01",
+                    ("INFO", "Parsing file ./data/duplicate_repo.spdx.xml"),
+                    ("INFO", "Found 1 git repositories"),
+                    ("INFO", "Scheduling tasks"),
+                    ("INFO", "Generating metrics"),
                 ],
             )
-            self.assertEqual(result.exit_code, 0)
-            # Check logs
-            self.assertIn("INFO:root:Parsing file ./data/duplicate_repo.spdx.xml", logger.output)
-            self.assertIn("INFO:root:Found 1 git repositories", logger.output)
-            self.assertIn("INFO:root:Scheduling tasks", logger.output)
-            self.assertIn("INFO:root:Generating metrics", logger.output)
 
             # Check metrics
-            with open(self.temp_file.name) as f:
-                metrics = json.load(f)
-                self.assertEqual(len(metrics["packages"]), 2)
-                self.assertIn("SPDXRef-angular", metrics["packages"])
-                self.assertIn("SPDXRef-angular-2", metrics["packages"])
-                self.assertEqual(metrics["packages"]["SPDXRef-angular"]["repository"], "https://github.com/angular/quickstart")
-                self.assertEqual(metrics["packages"]["SPDXRef-angular-2"]["repository"], "https://github.com/angular/quickstart")
-                quickstart_metrics = metrics["packages"]["SPDXRef-angular"]["metrics"]
-                self.assertEqual(quickstart_metrics["total_commits"], 164)
-                self.assertEqual(quickstart_metrics["total_contributors"], 25)
-                self.assertEqual(quickstart_metrics["pony_factor"], 2)
-                self.assertEqual(quickstart_metrics["elephant_factor"], 2)
-                self.assertEqual(quickstart_metrics["file_types_other"], 683)
-                self.assertEqual(quickstart_metrics["file_types_binary"], 0)
-                self.assertEqual(quickstart_metrics["file_types_code"], 479)
-                self.assertEqual(quickstart_metrics["commit_size_added_lines"], 53121)
-                self.assertEqual(quickstart_metrics["commit_size_removed_lines"], 51852)
-                self.assertEqual(quickstart_metrics["message_size_total"], 9778)
-                self.assertAlmostEqual(quickstart_metrics["message_size_mean"], 59.6219, delta=0.1)
-                self.assertEqual(quickstart_metrics["message_size_median"], 46)
-                self.assertEqual(quickstart_metrics["developer_categories_core"], 3)
-                self.assertEqual(quickstart_metrics["developer_categories_regular"], 13)
-                self.assertEqual(quickstart_metrics["developer_categories_casual"], 9)
-                # From 2000 to 2025 there are 9132 days
-                self.assertAlmostEqual(quickstart_metrics["commits_per_week"], 164 / (9132 / 7), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_month"], 164 / (9132 / 30), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_year"], 164 / (9132 / 365), delta=0.1)
+            metrics = self._read_metrics()
+            self.assertEqual(len(metrics["packages"]), 2)
+            self.assertPackage(metrics, "SPDXRef-angular", "https://github.com/angular/quickstart", QUICKSTART_METRICS_2000_2025)
+            self.assertPackage(
+                metrics, "SPDXRef-angular-2", "https://github.com/angular/quickstart", QUICKSTART_METRICS_2000_2025
+            )
 
     def test_non_git_repo(self):
         """Check if it flags non-git dependencies"""
 
         with self.assertLogs(logging.getLogger()) as logger:
-            result = self.runner.invoke(
-                trustable_grimoirelab_score,
+            result = self._run_cli("./data/mercurial_repo.spdx.xml", "--from-date=2000-01-01", "--to-date=2025-01-01")
+            self.assertEqual(result.exit_code, 0)
+            # Check logs
+            self.assertLogged(
+                logger,
                 [
-                    "./data/mercurial_repo.spdx.xml",
-                    "--grimoirelab-url",
-                    GRIMOIRELAB_URL,
-                    "--grimoirelab-user",
-                    "admin",
-                    "--grimoirelab-password",
-                    "admin",
-                    "--opensearch-url",
-                    self.opensearch_url,
-                    "--opensearch-index",
-                    "events",
-                    "--output",
-                    self.temp_file.name,
-                    "--from-date=2000-01-01",
-                    "--to-date=2025-01-01",
+                    ("INFO", "Parsing file ./data/mercurial_repo.spdx.xml"),
+                    ("WARNING", "Could not find a git repository for SPDXRef-sql-dk (sql-dk)"),
+                    ("INFO", "Found 1 git repositories"),
+                    ("INFO", "Scheduling tasks"),
+                    ("INFO", "Generating metrics"),
                 ],
             )
-            self.assertEqual(result.exit_code, 0)
-            # Check logs
-            self.assertIn("INFO:root:Parsing file ./data/mercurial_repo.spdx.xml", logger.output)
-            self.assertIn("WARNING:root:Could not find a git repository for SPDXRef-sql-dk (sql-dk)", logger.output)
-            self.assertIn("INFO:root:Found 1 git repositories", logger.output)
-            self.assertIn("INFO:root:Scheduling tasks", logger.output)
-            self.assertIn("INFO:root:Generating metrics", logger.output)
 
             # Check metrics
-            with open(self.temp_file.name) as f:
-                metrics = json.load(f)
-                self.assertEqual(len(metrics["packages"]), 2)
+            metrics = self._read_metrics()
+            self.assertEqual(len(metrics["packages"]), 2)
+
+            self.assertPackage(metrics, "SPDXRef-angular", "https://github.com/angular/quickstart", QUICKSTART_METRICS_2000_2025)
 
-                self.assertIn("SPDXRef-angular", metrics["packages"])
-                self.assertEqual(metrics["packages"]["SPDXRef-angular"]["repository"], "https://github.com/angular/quickstart")
-                quickstart_metrics = metrics["packages"]["SPDXRef-angular"]["metrics"]
-                self.assertEqual(quickstart_metrics["total_commits"], 164)
-                self.assertEqual(quickstart_metrics["total_contributors"], 25)
-                self.assertEqual(quickstart_metrics["pony_factor"], 2)
-                self.assertEqual(quickstart_metrics["elephant_factor"], 2)
-                self.assertEqual(quickstart_metrics["file_types_other"], 683)
-                self.assertEqual(quickstart_metrics["file_types_binary"], 0)
-                self.assertEqual(quickstart_metrics["file_types_code"], 479)
-                self.assertEqual(quickstart_metrics["commit_size_added_lines"], 53121)
-                self.assertEqual(quickstart_metrics["commit_size_removed_lines"], 51852)
-                self.assertEqual(quickstart_metrics["message_size_total"], 9778)
-                self.assertAlmostEqual(quickstart_metrics["message_size_mean"], 59.6219, delta=0.1)
-                self.assertEqual(quickstart_metrics["message_size_median"], 46)
-                self.assertEqual(quickstart_metrics["developer_categories_core"], 3)
-                self.assertEqual(quickstart_metrics["developer_categories_regular"], 13)
-                self.assertEqual(quickstart_metrics["developer_categories_casual"], 9)
-                # From 2000 to 2025 there are 9132 days
-                self.assertAlmostEqual(quickstart_metrics["commits_per_week"], 164 / (9132 / 7), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_month"], 164 / (9132 / 30), delta=0.1)
-                self.assertAlmostEqual(quickstart_metrics["commits_per_year"], 164 / (9132 / 365), delta=0.1)
-
-                self.assertIn("SPDXRef-sql-dk", metrics["packages"])
-                self.assertEqual(metrics["packages"]["SPDXRef-sql-dk"]["metrics"], None)
+            self.assertIn("SPDXRef-sql-dk", metrics["packages"])
+            self.assertEqual(metrics["packages"]["SPDXRef-sql-dk"]["metrics"], None)
 
 
 if __name__ == "__main__":
@@ -25,11 +25,17 @@ import click
 
 @click.command()
 @click.argument("module", required=False, default="unit")
-def test(module):
-    test_suite = unittest.TestLoader().discover(
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), module),
-        pattern="test_*.py",
-    )
+@click.option("--name", help="Run only the given test, e.g. unit.test_cli.TestCli.test_valid_file")
+def test(module, name):
+    loader = unittest.TestLoader()
+    if name:
+        # Only the modules of the given test are imported
+        test_suite = loader.loadTestsFromName(name)
+    else:
+        test_suite = loader.discover(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), module),
+            pattern="test_*.py",
+        )
     result = unittest.TextTestRunner(buffer=True).run(test_suite)
     sys.exit(not result.wasSuccessful())
 
@@ -16,11 +16,13 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+import collections
 import datetime
 import json
 import logging
 import os
 import tempfile
+import threading
 import unittest
 
 import httpretty
@@ -30,6 +32,7 @@ from unittest.mock import patch
 
 from click.testing import CliRunner
 from trustable_cli.cli import trustable_grimoirelab_score, get_repository
+from trustable_cli.metrics import GitEventsAnalyzer
 
 
 GRIMOIRELAB_URL = "http://localhost:8000"
@@ -39,6 +42,27 @@ OPENSEARCH_INDEX = "events"
 TASK_URL = f"{GRIMOIRELAB_URL}/datasources/add_repository"
 REPOSITORIES_URL = f"{GRIMOIRELAB_URL}/datasources/repositories/"
 
+LINUX_URI = "https://git.kernel.org/pub/scm/linux/kernel/git/stable/linux"
+
+TASK_SCHEDULED_BODY = json.dumps({"message": "Task scheduled correctly"})
+
+VALID_GIT_URIS = [
+    "https://git.myproject.org/MyProject.git",
+    "http://git.myproject.org/MyProject.git",
+    "git+https://git.myproject.org/MyProject.git",
+    "git+http://git.myproject.org/MyProject.git",
+    "git+https://git.myproject.org/MyProject.git@v1.0",
+    "git://git.myproject.org/MyProject.git",
+    "git://git.myproject.org/MyProject.git@master",
+    "git+git://git.myproject.org/MyProject.git",
+]
+INVALID_GIT_URIS = [
+    "http://git.myproject.org/MyProject",
+    "git+https://git.myproject.org/MyProject",
+    "svn+svn://svn.myproject.org/svn/MyProject",
+    "https://git.myproject.org/MyProject/file.py",
+]
+
 
 def setup_add_repository_mock_server():
     """Set up a mock HTTP server for API calls"""
@@ -46,16 +70,12 @@ def setup_add_repository_mock_server():
     http_requests = []
 
     def request_callback(request, uri, headers):
-        last_request = httpretty.last_request()
-        http_requests.append(last_request)
-        data = {"message": "Task scheduled correctly"}
-        body = json.dumps(data)
+        http_requests.append(request)
 
-        return (200, headers, body)
+        return (200, headers, TASK_SCHEDULED_BODY)
 
     def exception_callback(request, uri, headers):
-        last_request = httpretty.last_request()
-        http_requests.append(last_request)
+        http_requests.append(request)
 
         raise requests.ConnectionError()
 
@@ -74,20 +94,21 @@ def setup_get_repositories_mock_server():
 
     http_requests = []
 
-    def request_callback(request, uri, headers):
-        last_request = httpretty.last_request()
-        http_requests.append(last_request)
-        data = {
-            "results": [
-                {
-                    "task": {
-                        "last_run": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
-                        "status": "completed",
-                    }
+    # Tasks finish when the server is set up; the response never changes
+    data = {
+        "results": [
+            {
+                "task": {
+                    "last_run": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+                    "status": "completed",
                 }
-            ]
-        }
-        body = json.dumps(data)
+            }
+        ]
+    }
+    body = json.dumps(data)
+
+    def request_callback(request, uri, headers):
+        http_requests.append(request)
 
         return 200, headers, body
 
@@ -96,68 +117,130 @@ def setup_get_repositories_mock_server():
     return http_requests
 
 
-def setup_get_never_ending_repositories_mock_server():
-    """Setup a mock HTTP server for repository API calls"""
+def setup_get_never_ending_repositories_mock_server(clock):
+    """Setup a mock HTTP server for repository API calls whose tasks never end
 
-    http_requests = []
+    :param clock: Fake clock, as a one-item list, read when the status is checked
 
-    def request_callback(request, uri, headers):
-        last_request = httpretty.last_request()
-        http_requests.append(last_request)
-        last_run = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=365)
-        data = {
-            "results": [
-                {
-                    "task": {
-                        "last_run": last_run.isoformat(),
-                        "status": "running",
-                    }
+    :return: Dict with the times when the status of each repository was checked
+    """
+    checks = collections.defaultdict(list)
+
+    last_run = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=365)
+    data = {
+        "results": [
+            {
+                "task": {
+                    "last_run": last_run.isoformat(),
+                    "status": "running",
                 }
-            ]
-        }
-        body = json.dumps(data)
+            }
+        ]
+    }
+    body = json.dumps(data)
+
+    def request_callback(request, uri, headers):
+        checks[request.querystring["uri"][0]].append(clock[0])
 
         return 200, headers, body
 
     httpretty.register_uri(httpretty.GET, REPOSITORIES_URL, responses=[httpretty.Response(body=request_callback)])
 
+    return checks
+
+
+def setup_add_repository_blocked_mock_server(first_uri, release, status=200):
+    """Set up a mock HTTP server where only the task of a repository is scheduled at first
+
+    The rest of the requests are answered once `release` is set.
+
+    :param first_uri: Repository whose task is scheduled without waiting
+    :param release: Event that lets the rest of the requests be answered
+    :param status: Status code of the rest of the requests
+
+    :return: List with the answered requests
+    """
+    http_requests = []
+
+    def request_callback(request, uri, headers):
+        if json.loads(request.body)["uri"] != first_uri:
+            release.wait(timeout=10)
+            if status != 200:
+                http_requests.append(request)
+                return status, headers, json.dumps({"error": "Server error"})
+
+        http_requests.append(request)
+
+        return 200, headers, TASK_SCHEDULED_BODY
+
+    httpretty.register_uri(httpretty.POST, TASK_URL, responses=[httpretty.Response(body=request_callback)])
+
     return http_requests
 
 
+def setup_fake_clock(mock_time):
+    """Make the mocked time module run on a clock that only moves forward when sleeping
+
+    :return: One-item list with the current time of the clock
+    """
+    clock = [0.0]
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    mock_time.monotonic.side_effect = lambda: clock[0]
+    mock_time.sleep.side_effect = sleep
+
+    return clock
+
+
 class TestCli(unittest.TestCase):
-    def setUp(self):
-        logging.getLogger().handlers = []
-        # temporary file for output metrics
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False)
+    @classmethod
+    def setUpClass(cls):
+        cls.runner = CliRunner()
+        # temporary file for output metrics, shared by all the tests
+        fd, cls.temp_path = tempfile.mkstemp()
+        os.close(fd)
 
-    def tearDown(self):
-        os.remove(self.temp_file.name)
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.temp_path)
 
-    @httpretty.activate
-    @patch("trustable_cli.cli.get_repository_metrics")
-    def test_valid_file(self, mock_get_repository_metrics):
-        """Check if it schedules tasks to analyze all git repositories from a valid file"""
+    def setUp(self):
+        logging.getLogger().handlers = []
+        # Don't let a test read the output of a previous one
+        open(self.temp_path, "w").close()
 
-        http_requests = setup_add_repository_mock_server()
-        http_requests_repos = setup_get_repositories_mock_server()
-        mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
+    def _invoke(self, filename, *args, grimoirelab_url=GRIMOIRELAB_URL):
+        """Run the command on the given file with the common test arguments"""
 
-        runner = CliRunner()
-        result = runner.invoke(
+        return self.runner.invoke(
             trustable_grimoirelab_score,
             [
-                "./data/valid.spdx.xml",
+                filename,
                 "--grimoirelab-url",
-                GRIMOIRELAB_URL,
+                grimoirelab_url,
                 "--opensearch-url",
                 OPENSEARCH_URL,
                 "--opensearch-index",
                 OPENSEARCH_INDEX,
                 "--output",
-                self.temp_file.name,
+                self.temp_path,
+                *args,
             ],
         )
 
+    @httpretty.activate
+    @patch("trustable_cli.cli.get_repository_metrics")
+    def test_valid_file(self, mock_get_repository_metrics):
+        """Check if it schedules tasks to analyze all git repositories from a valid file"""
+
+        http_requests = setup_add_repository_mock_server()
+        http_requests_repos = setup_get_repositories_mock_server()
+        mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
+
+        result = self._invoke("./data/valid.spdx.xml")
+
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Found 5 git repositories", result.output)
         self.assertIn("Scheduling tasks", result.output)
@@ -172,14 +255,11 @@ class TestCli(unittest.TestCase):
             "SPDXRef-bootstrap-attr.bst-2.5.2",
             "SPDXRef-bootstrap-acl.bst-2.3.2",
         ]
-        with open(self.temp_file.name) as f:
+        with open(self.temp_path) as f:
             metrics = json.load(f)
-            self.assertEqual(len(metrics["packages"]), 5)
-            i = 0
-            for package, data in metrics["packages"].items():
-                self.assertEqual(package, expected_packages[i])
-                self.assertEqual(data["metrics"]["num_commits"], 10)
-                i += 1
+            self.assertEqual(list(metrics["packages"]), expected_packages)
+            num_commits = [data["metrics"]["num_commits"] for data in metrics["packages"].values()]
+            self.assertEqual(num_commits, [10] * 5)
 
     @httpretty.activate
     @patch("trustable_cli.cli.get_repository_metrics")
@@ -190,22 +270,7 @@ class TestCli(unittest.TestCase):
         http_requests_repos = setup_get_repositories_mock_server()
         mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
 
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/valid.spdx.xml",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-                "--verbose",
-            ],
-        )
+        result = self._invoke("./data/valid.spdx.xml", "--verbose")
 
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Found 5 git repositories", result.output)
@@ -219,21 +284,7 @@ class TestCli(unittest.TestCase):
         """Check if it returns an error when the file type is not valid"""
 
         http_requests = setup_add_repository_mock_server()
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "invalid.doc",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-            ],
-        )
+        result = self._invoke("invalid.doc")
 
         self.assertEqual(result.exit_code, 1)
         self.assertIn("Unsupported SPDX file type", result.output)
@@ -244,21 +295,7 @@ class TestCli(unittest.TestCase):
         """Check if it returns an error when the SBoM is not formatted correctly"""
 
         http_requests = setup_add_repository_mock_server()
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/invalid_format.spdx.json",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-            ],
-        )
+        result = self._invoke("./data/invalid_format.spdx.json")
 
         self.assertEqual(result.exit_code, 1)
         self.assertIn("Error while parsing document", result.output)
@@ -273,21 +310,7 @@ class TestCli(unittest.TestCase):
         http_requests_repos = setup_get_repositories_mock_server()
         mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
 
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/missing_repo.spdx.xml",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-            ],
-        )
+        result = self._invoke("./data/missing_repo.spdx.xml")
 
         self.assertEqual(result.exit_code, 0)
         self.assertIn(
@@ -305,47 +328,54 @@ class TestCli(unittest.TestCase):
         http_requests_repos = setup_get_repositories_mock_server()
         mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
 
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/invalid_repo.spdx.xml",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-            ],
-        )
+        result = self._invoke("./data/invalid_repo.spdx.xml")
 
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Could not find a git repository for SPDXRef-ncurses-6.40 (bootstrap/ncurses.bst)", result.output)
         self.assertEqual(len(http_requests), 4)
         self.assertEqual(len(http_requests_repos), 4)
 
+    @httpretty.activate
+    def test_invalid_file_pattern(self):
+        """Check if it returns an error when a file type pattern is not a valid regular expression"""
+
+        http_requests = setup_add_repository_mock_server()
+        result = self._invoke("./data/valid.spdx.xml", "--code-file-pattern", "*.py")
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("Invalid value for '--code-file-pattern': invalid regular expression", result.output)
+        self.assertEqual(len(http_requests), 0)
+
+    @httpretty.activate
+    @patch("trustable_cli.cli.get_repository_metrics")
+    def test_empty_file_pattern(self, mock_get_repository_metrics):
+        """Check if empty file type patterns keep the default file types"""
+
+        setup_add_repository_mock_server()
+        setup_get_repositories_mock_server()
+        mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
+
+        result = self._invoke("./data/valid.spdx.xml", "--code-file-pattern", "", "--binary-file-pattern", "")
+
+        self.assertEqual(result.exit_code, 0)
+        kwargs = mock_get_repository_metrics.call_args.kwargs
+        self.assertIsNone(kwargs["code_file_pattern"])
+        self.assertIsNone(kwargs["binary_file_pattern"])
+
+        analyzer = GitEventsAnalyzer(
+            code_file_pattern=kwargs["code_file_pattern"], binary_file_pattern=kwargs["binary_file_pattern"]
+        )
+        self.assertTrue(analyzer.is_code_file("main.py"))
+        self.assertTrue(analyzer.is_binary_file("release.tar"))
+        self.assertFalse(analyzer.is_code_file("README.md"))
+        self.assertFalse(analyzer.is_binary_file("README.md"))
+
     @httpretty.activate
     def test_no_file(self):
         """Check if it returns an error when the file does not exist"""
 
         http_requests = setup_add_repository_mock_server()
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/no_file.xml",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-            ],
-        )
+        result = self._invoke("./data/no_file.xml")
 
         self.assertEqual(result.exit_code, 1)
         self.assertIn("No such file or directory", result.output)
@@ -356,53 +386,26 @@ class TestCli(unittest.TestCase):
         """Check if it returns a warning when there is a server error"""
 
         http_requests = setup_add_repository_mock_server()
-        runner = CliRunner()
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/valid.spdx.xml",
-                "--grimoirelab-url",
-                "http://localhost:8001",
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-            ],
-        )
+        result = self._invoke("./data/valid.spdx.xml", grimoirelab_url="http://localhost:8001")
 
         self.assertEqual(result.exit_code, 1)
         self.assertIn("Error scheduling task", result.output)
-        self.assertEqual(len(http_requests), 5)
+        # Tasks are scheduled concurrently; each one is retried 5 times
+        self.assertEqual(len(http_requests), 25)
 
     @httpretty.activate
+    @patch("trustable_cli.cli.random.uniform", return_value=1.0)
+    @patch("trustable_cli.cli.time")
     @patch("trustable_cli.cli.get_repository_metrics")
-    def test_never_ending_repository(self, mock_get_repository_metrics):
+    def test_never_ending_repository(self, mock_get_repository_metrics, mock_time, mock_uniform):
         """Check if it returns a warning when a repository task never ends"""
 
         http_requests = setup_add_repository_mock_server()
-        http_requests_repos = setup_get_never_ending_repositories_mock_server()
+        clock = setup_fake_clock(mock_time)
+        checks = setup_get_never_ending_repositories_mock_server(clock)
         mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
 
-        runner = CliRunner()
-
-        result = runner.invoke(
-            trustable_grimoirelab_score,
-            [
-                "./data/valid.spdx.xml",
-                "--grimoirelab-url",
-                GRIMOIRELAB_URL,
-                "--opensearch-url",
-                OPENSEARCH_URL,
-                "--opensearch-index",
-                OPENSEARCH_INDEX,
-                "--output",
-                self.temp_file.name,
-                "--repository-timeout",
-                15,
-            ],
-        )
+        result = self._invoke("./data/valid.spdx.xml", "--repository-timeout", 15)
 
         self.assertEqual(result.exit_code, 0)
         self.assertIn(
@@ -410,36 +413,125 @@ class TestCli(unittest.TestCase):
             result.output,
         )
         self.assertEqual(len(http_requests), 5)
-        self.assertEqual(len(http_requests_repos), 10)
+
+        # The timeout starts once all the tasks are scheduled
+        self.assertEqual(clock[0], 15)
+
+        # Repositories might be checked while the rest of the tasks are scheduled.
+        # Once all of them are, status is checked at start and after waiting
+        # 2, 3, 4.5 and the remaining 5.5 seconds.
+        self.assertEqual(len(checks), 5)
+        for uri, times in checks.items():
+            with self.subTest(uri=uri):
+                self.assertIn(times.count(0), (1, 2))
+                self.assertEqual([t for t in times if t > 0], [2, 5, 9.5, 15])
+
+    @httpretty.activate
+    @patch("trustable_cli.cli.get_repository_metrics")
+    def test_repository_ready_while_scheduling(self, mock_get_repository_metrics):
+        """Check if repositories are analyzed while the rest of the tasks are being scheduled"""
+
+        release = threading.Event()
+        http_requests = setup_add_repository_blocked_mock_server(LINUX_URI, release)
+        setup_get_repositories_mock_server()
+
+        scheduled_on_first_metrics = []
+
+        def get_metrics(repository, **kwargs):
+            if not release.is_set():
+                scheduled_on_first_metrics.append(len(http_requests))
+                release.set()
+            return {"metrics": {"num_commits": 10}}
+
+        mock_get_repository_metrics.side_effect = get_metrics
+
+        result = self._invoke("./data/valid.spdx.xml")
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(len(http_requests), 5)
+
+        # Only its task was scheduled when the first metrics were collected
+        self.assertEqual(scheduled_on_first_metrics, [1])
+        self.assertEqual(mock_get_repository_metrics.call_args_list[0].args, (LINUX_URI,))
+
+        with open(self.temp_path) as f:
+            metrics = json.load(f)
+            num_commits = [data["metrics"]["num_commits"] for data in metrics["packages"].values()]
+            self.assertEqual(num_commits, [10] * 5)
+
+    @httpretty.activate
+    @patch("trustable_cli.cli.get_repository_metrics")
+    def test_server_error_while_polling(self, mock_get_repository_metrics):
+        """Check if it returns an error when a task can't be scheduled after polling started"""
+
+        release = threading.Event()
+        http_requests = setup_add_repository_blocked_mock_server(LINUX_URI, release, status=500)
+        setup_get_repositories_mock_server()
+
+        def get_metrics(repository, **kwargs):
+            release.set()
+            return {"metrics": {"num_commits": 10}}
+
+        mock_get_repository_metrics.side_effect = get_metrics
+
+        result = self._invoke("./data/valid.spdx.xml")
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Error scheduling task", result.output)
+        self.assertIn("500 Server Error", result.output)
+        self.assertEqual(len(http_requests), 5)
+
+        # The failing tasks were scheduled once polling had started
+        mock_get_repository_metrics.assert_called_once()
+        self.assertEqual(mock_get_repository_metrics.call_args.args, (LINUX_URI,))
+
+    @httpretty.activate
+    @patch("trustable_cli.cli.random.uniform", return_value=1.0)
+    @patch("trustable_cli.cli.time")
+    @patch("trustable_cli.cli.get_repository_metrics")
+    def test_repository_status_error(self, mock_get_repository_metrics, mock_time, mock_uniform):
+        """Check if other repositories are analyzed when the status of one of them can't be retrieved"""
+
+        setup_add_repository_mock_server()
+        setup_fake_clock(mock_time)
+        body = json.dumps(
+            {"results": [{"task": {"last_run": datetime.datetime.now(datetime.UTC).isoformat(), "status": "completed"}}]}
+        )
+
+        def request_callback(request, uri, headers):
+            if request.querystring["uri"][0] == LINUX_URI:
+                return 500, headers, "{}"
+            return 200, headers, body
+
+        httpretty.register_uri(httpretty.GET, REPOSITORIES_URL, responses=[httpretty.Response(body=request_callback)])
+        mock_get_repository_metrics.return_value = {"metrics": {"num_commits": 10}}
+
+        result = self._invoke("./data/valid.spdx.xml", "--repository-timeout", 15)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Error checking repository status: 500 Server Error", result.output)
+        self.assertIn(f"Timeout waiting for repository {LINUX_URI} to be ready", result.output)
+        self.assertNotIn(LINUX_URI, [call.args[0] for call in mock_get_repository_metrics.call_args_list])
+
+        with open(self.temp_path) as f:
+            metrics = json.load(f)
+            packages = metrics["packages"]
+            self.assertEqual(packages.pop("SPDXRef-public-linux-headers.bst-6.10.2"), {"metrics": None})
+            self.assertEqual(len(packages), 4)
+            for package, data in packages.items():
+                with self.subTest(package=package):
+                    self.assertEqual(data["metrics"], {"num_commits": 10})
 
 
 class TestGetRepository(unittest.TestCase):
     def test_valid_git_repository(self):
-        valid_git_uris = [
-            "https://git.myproject.org/MyProject.git",
-            "http://git.myproject.org/MyProject.git",
-            "git+https://git.myproject.org/MyProject.git",
-            "git+http://git.myproject.org/MyProject.git",
-            "git+https://git.myproject.org/MyProject.git@v1.0",
-            "git://git.myproject.org/MyProject.git",
-            "git://git.myproject.org/MyProject.git@master",
-            "git+git://git.myproject.org/MyProject.git",
-        ]
-
-        for uri in valid_git_uris:
+        for uri in VALID_GIT_URIS:
             with self.subTest(uri=uri):
                 result = get_repository(uri)
                 self.assertEqual(result, "https://git.myproject.org/MyProject")
 
     def test_invalid_git_repository(self):
-        invalid_git_uris = [
-            "http://git.myproject.org/MyProject",
-            "git+https://git.myproject.org/MyProject",
-            "svn+svn://svn.myproject.org/svn/MyProject",
-            "https://git.myproject.org/MyProject/file.py",
-        ]
-
-        for uri in invalid_git_uris:
+        for uri in INVALID_GIT_URIS:
             with self.subTest(uri=uri):
                 result = get_repository(uri)
                 self.assertEqual(result, None)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Bitergia
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import concurrent.futures
+import json
+import threading
+import unittest
+
+import httpretty
+
+from unittest.mock import patch
+
+from trustable_cli.grimoirelab_client import GrimoireLabClient
+
+GRIMOIRELAB_URL = "http://localhost:8000"
+
+REPOSITORIES_URL = f"{GRIMOIRELAB_URL}/datasources/repositories/"
+TOKEN_URL = f"{GRIMOIRELAB_URL}/token/"
+TOKEN_REFRESH_URL = f"{GRIMOIRELAB_URL}/token/refresh/"
+
+TOKEN_BODY = json.dumps({"access": "old-token", "refresh": "refresh-token"})
+TOKEN_REFRESH_BODY = json.dumps({"access": "new-token"})
+
+
+def setup_token_mock_server():
+    """Set up a mock HTTP server for the token API calls"""
+
+    http_requests = []
+
+    def refresh_callback(request, uri, headers):
+        http_requests.append(request)
+
+        return 200, headers, TOKEN_REFRESH_BODY
+
+    httpretty.register_uri(httpretty.POST, TOKEN_URL, body=TOKEN_BODY)
+    httpretty.register_uri(httpretty.POST, TOKEN_REFRESH_URL, responses=[httpretty.Response(body=refresh_callback)])
+
+    return http_requests
+
+
+class TestGrimoireLabClient(unittest.TestCase):
+    @httpretty.activate
+    def test_token_refresh(self):
+        """Check if the request is repeated with a new token when the token expired"""
+
+        http_requests_refresh = setup_token_mock_server()
+        httpretty.register_uri(
+            httpretty.GET,
+            REPOSITORIES_URL,
+            responses=[httpretty.Response(body="{}", status=403), httpretty.Response(body='{"results": []}', status=200)],
+        )
+
+        client = GrimoireLabClient(GRIMOIRELAB_URL, "user", "password")
+        client.connect()
+        response = client.get("datasources/repositories/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"results": []})
+        self.assertEqual(len(http_requests_refresh), 1)
+
+        repeated_request = httpretty.latest_requests()[-1]
+        self.assertEqual(repeated_request.path, "/datasources/repositories/")
+        self.assertEqual(repeated_request.headers["Authorization"], "Bearer new-token")
+
+    @httpretty.activate
+    def test_token_refresh_rejected(self):
+        """Check if the response is returned when the request fails again after refreshing the token"""
+
+        http_requests_refresh = setup_token_mock_server()
+        http_requests = []
+
+        def request_callback(request, uri, headers):
+            http_requests.append(request)
+
+            return 403, headers, "{}"
+
+        httpretty.register_uri(httpretty.GET, REPOSITORIES_URL, responses=[httpretty.Response(body=request_callback)])
+
+        client = GrimoireLabClient(GRIMOIRELAB_URL, "user", "password")
+        client.connect()
+        response = client.get("datasources/repositories/")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(http_requests), 2)
+        self.assertEqual(len(http_requests_refresh), 1)
+
+    @httpretty.activate
+    @patch("trustable_cli.grimoirelab_client.STATUS_RETRIES_BACKOFF_FACTOR", 0)
+    def test_server_error_retry(self):
+        """Check if requests failing with a transient server error are retried"""
+
+        httpretty.register_uri(
+            httpretty.GET,
+            REPOSITORIES_URL,
+            responses=[
+                httpretty.Response(body="", status=503),
+                httpretty.Response(body="", status=502),
+                httpretty.Response(body='{"results": []}', status=200),
+            ],
+        )
+
+        client = GrimoireLabClient(GRIMOIRELAB_URL)
+        client.connect()
+        response = client.get("datasources/repositories/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(httpretty.latest_requests()), 3)
+
+    @httpretty.activate
+    def test_concurrent_token_refresh(self):
+        """Check if the token is refreshed once when several threads find it expired"""
+
+        num_threads = 4
+        http_requests_refresh = setup_token_mock_server()
+        # Every thread is rejected with the old token before any of them refreshes it
+        barrier = threading.Barrier(num_threads, timeout=10)
+
+        def request_callback(request, uri, headers):
+            if request.headers["Authorization"] == "Bearer new-token":
+                return 200, headers, "{}"
+
+            barrier.wait()
+            return 403, headers, "{}"
+
+        httpretty.register_uri(httpretty.GET, REPOSITORIES_URL, responses=[httpretty.Response(body=request_callback)])
+
+        client = GrimoireLabClient(GRIMOIRELAB_URL, "user", "password")
+        client.connect()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = [executor.submit(client.get, "datasources/repositories/") for _ in range(num_threads)]
+            status_codes = [future.result().status_code for future in futures]
+
+        self.assertEqual(status_codes, [200] * num_threads)
+        self.assertEqual(len(http_requests_refresh), 1)
+        self.assertEqual(client.session.headers["Authorization"], "Bearer new-token")
+
+    def test_reconnect_replaced_session(self):
+        """Check if a session is not replaced again when another thread already reconnected"""
+
+        client = GrimoireLabClient(GRIMOIRELAB_URL)
+        client.connect()
+        failed_session = client.session
+
+        client._reconnect(failed_session)
+        session = client.session
+        self.assertIsNot(session, failed_session)
+
+        client._reconnect(failed_session)
+        self.assertIs(client.session, session)
+
+
+if __name__ == "__main__":
+    unittest.main()
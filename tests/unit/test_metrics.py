@@ -16,10 +16,21 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+import concurrent.futures
 import json
 import unittest
 
-from trustable_cli.metrics import GitEventsAnalyzer
+from trustable_cli.metrics import GitEventsAnalyzer, connect_to_opensearch
+
+# Commits added to the fixture events; the analyzer only reads them
+EXAMPLE2_COMMIT = {
+    "type": "org.grimoirelab.events.git.commit",
+    "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
+}
+EXAMPLE_NEW_COMMIT = {
+    "type": "org.grimoirelab.events.git.commit",
+    "data": {"Author": "Author 1 <author1@example_new.com>", "message": "Another commit"},
+}
 
 
 def read_file(filename):
@@ -28,9 +39,13 @@ def read_file(filename):
 
 
 class TestGitEventsAnalyzer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The analyzer doesn't modify the events; parse them once for all tests
+        cls.events = json.loads(read_file("data/events.json"))
+
     def setUp(self):
         self.analyzer = GitEventsAnalyzer()
-        self.events = json.loads(read_file("data/events.json"))
 
     def test_commit_count(self):
         """Test that the commit count is calculated correctly"""
@@ -44,12 +59,7 @@ class TestGitEventsAnalyzer(unittest.TestCase):
         self.analyzer.process_events(self.events)
         self.assertEqual(self.analyzer.get_contributor_count(), 3)
 
-        extra_events = [
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            }
-        ]
+        extra_events = [EXAMPLE2_COMMIT]
         self.analyzer.process_events(extra_events)
         self.assertEqual(self.analyzer.get_contributor_count(), 4)
 
@@ -62,20 +72,7 @@ class TestGitEventsAnalyzer(unittest.TestCase):
         self.assertEqual(self.analyzer.get_pony_factor(), 1)
 
         # Include commits from another author to increase the pony factor
-        extra_events = [
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-        ]
+        extra_events = [EXAMPLE2_COMMIT] * 3
         self.analyzer.process_events(extra_events)
         self.assertEqual(self.analyzer.get_pony_factor(), 2)
 
@@ -88,28 +85,7 @@ class TestGitEventsAnalyzer(unittest.TestCase):
         self.assertEqual(self.analyzer.get_elephant_factor(), 1)
 
         # Include commits from another company to increase the elephant factor.
-        extra_events = [
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example2.com>", "message": "Another commit"},
-            },
-        ]
+        extra_events = [EXAMPLE2_COMMIT] * 5
         self.analyzer.process_events(extra_events)
         self.assertEqual(self.analyzer.get_elephant_factor(), 2)
 
@@ -193,29 +169,25 @@ class TestGitEventsAnalyzer(unittest.TestCase):
         self.assertDictEqual(categories, {"core": 1, "regular": 1, "casual": 1})
 
         # Add a core developer to change the categories
-        extra_events = [
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example_new.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example_new.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example_new.com>", "message": "Another commit"},
-            },
-            {
-                "type": "org.grimoirelab.events.git.commit",
-                "data": {"Author": "Author 1 <author1@example_new.com>", "message": "Another commit"},
-            },
-        ]
+        extra_events = [EXAMPLE_NEW_COMMIT] * 4
 
         self.analyzer.process_events(extra_events)
         categories = self.analyzer.get_developer_categories()
         self.assertDictEqual(categories, {"core": 2, "regular": 1, "casual": 1})
 
 
+class TestConnectToOpenSearch(unittest.TestCase):
+    def test_shared_connection(self):
+        """Check if threads connecting with the same parameters share one connection"""
+
+        url = "http://localhost:9201/"
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            connections = list(executor.map(lambda _: connect_to_opensearch(url, pool_maxsize=8), range(32)))
+
+        self.assertEqual(len({id(connection) for connection in connections}), 1)
+        self.assertIsNot(connect_to_opensearch(url, pool_maxsize=4), connections[0])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -18,9 +18,13 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import datetime
+import functools
 import json
 import logging
+import queue
+import random
 import re
 import sys
 import time
@@ -29,17 +33,34 @@ import typing
 import click
 import requests
 
-from spdx_tools.spdx.model import SpdxNone, SpdxNoAssertion
-from spdx_tools.spdx.parser.error import SPDXParsingError
-from spdx_tools.spdx.parser.parse_anything import parse_file
-
 from trustable_cli.grimoirelab_client import GrimoireLabClient
 from trustable_cli.metrics import get_repository_metrics
 
 if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
     from typing import Any
 
-GIT_REPO_REGEX = r"((git|http(s)?)|(git@[\w\.]+))://?([\w\.@\:/\-~]+)(\.git)(/)?"
+POLLING_MIN_INTERVAL = 2
+POLLING_MAX_INTERVAL = 30
+POLLING_BACKOFF_FACTOR = 1.5
+
+GIT_REPO_REGEX = r"(?:git|https?|git@[\w.]+)://?(?P<repository>[\w.@:/\-~]+)\.git"
+_GIT_REPO_RE = re.compile(GIT_REPO_REGEX)
+
+
+def compile_pattern(ctx: click.Context, param: click.Parameter, value: str | None) -> re.Pattern | None:
+    """Compile the regular expression given in a command option.
+
+    Patterns are compiled once when the command starts instead of
+    once per analyzed repository.
+    """
+    if not value:
+        return None
+
+    try:
+        return re.compile(value)
+    except re.error as e:
+        raise click.BadParameter(f"invalid regular expression: {e}")
 
 
 @click.command()
@@ -68,18 +89,23 @@ GIT_REPO_REGEX = r"((git|http(s)?)|(git@[\w\.]+))://?([\w\.@\:/\-~]+)(\.git)(/)?
     "--from-date",
     type=click.DateTime(formats=["%Y-%m-%d"]),
     help="Start date, by default last year",
-    default=(datetime.datetime.today() - datetime.timedelta(days=365)).strftime("%Y-%m-%d"),
 )
 @click.option(
     "--to-date",
     type=click.DateTime(formats=["%Y-%m-%d"]),
     help="End date, by default today",
-    default=datetime.datetime.today().strftime("%Y-%m-%d"),
 )
 @click.option("--verify-certs", is_flag=True, default=False, help="Verify SSL/TLS certificates")
 @click.option("--verbose", is_flag=True, default=False, help="Increase output verbosity")
-@click.option("--code-file-pattern", help="Regular expression to match code file types")
-@click.option("--binary-file-pattern", help="Regular expression to match binary file types")
+@click.option("--code-file-pattern", help="Regular expression to match code file types", callback=compile_pattern)
+@click.option("--binary-file-pattern", help="Regular expression to match binary file types", callback=compile_pattern)
+@click.option(
+    "--max-workers",
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent requests to GrimoireLab and OpenSearch",
+    default=16,
+    show_default=True,
+)
 def trustable_grimoirelab_score(
     filename: str,
     grimoirelab_url: str,
@@ -93,8 +119,9 @@ def trustable_grimoirelab_score(
     to_date: datetime.datetime | None = None,
     verify_certs: bool = False,
     verbose: bool = False,
-    code_file_pattern: str | None = None,
-    binary_file_pattern: str | None = None,
+    code_file_pattern: re.Pattern | None = None,
+    binary_file_pattern: re.Pattern | None = None,
+    max_workers: int = 16,
 ) -> None:
     """Calculate metrics for Trustable using GrimoireLab.
 
@@ -107,17 +134,28 @@ def trustable_grimoirelab_score(
 
     FILENAME: SPDX SBoM file with git repositories
     """
+    # spdx-tools is slow to import; load it only when the command runs
+    from spdx_tools.spdx.parser.error import SPDXParsingError
+
     log_level = "DEBUG" if verbose else "INFO"
     logging.basicConfig(level=log_level, format="%(asctime)s - %(levelname)s - %(message)s")
 
+    # Default dates are set when the command runs, not when it is defined
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    if to_date is None:
+        to_date = today
+    if from_date is None:
+        from_date = today - datetime.timedelta(days=365)
+
     try:
         logging.info(f"Parsing file {filename}")
 
-        grimoirelab_client = GrimoireLabClient(grimoirelab_url, grimoirelab_user, grimoirelab_password)
+        grimoirelab_client = GrimoireLabClient(grimoirelab_url, grimoirelab_user, grimoirelab_password, pool_maxsize=max_workers)
         grimoirelab_client.connect()
 
         packages = get_sbom_packages(filename)
-        git_urls = list(set(repo for repo in packages.values() if is_valid(repo)))
+        # Packages without a git repository are stored as None
+        git_urls = list(dict.fromkeys(repo for repo in packages.values() if repo))
 
         if len(git_urls) > 0:
             logging.info(f"Found {len(git_urls)} git repositories")
@@ -125,30 +163,38 @@ def trustable_grimoirelab_score(
             logging.info("Could not find any git repositories to analyze")
             sys.exit(0)
 
-        schedule_repositories(git_urls, grimoirelab_client)
-
-        metrics = generate_metrics_when_ready(
-            grimoirelab_client=grimoirelab_client,
-            repositories=git_urls,
-            opensearch_url=opensearch_url,
-            opensearch_index=opensearch_index,
-            from_date=from_date,
-            to_date=to_date,
-            verify_certs=verify_certs,
-            timeout=repository_timeout,
-            code_file_pattern=code_file_pattern,
-            binary_file_pattern=binary_file_pattern,
-        )
+        # Repositories are checked as soon as their tasks are scheduled
+        scheduled = queue.Queue()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            scheduling = executor.submit(schedule_repositories, git_urls, grimoirelab_client, max_workers, scheduled)
+
+            metrics = generate_metrics_when_ready(
+                grimoirelab_client=grimoirelab_client,
+                scheduled=scheduled,
+                scheduling=scheduling,
+                opensearch_url=opensearch_url,
+                opensearch_index=opensearch_index,
+                from_date=from_date,
+                to_date=to_date,
+                verify_certs=verify_certs,
+                timeout=repository_timeout,
+                code_file_pattern=code_file_pattern,
+                binary_file_pattern=binary_file_pattern,
+                max_workers=max_workers,
+            )
 
         package_metrics = {"packages": {}}
+        repositories_metrics = metrics["repositories"]
+        packages_metrics = package_metrics["packages"]
         for package, repo in packages.items():
-            if repo and repo in metrics["repositories"]:
-                package_metrics["packages"][package] = metrics["repositories"][repo]
-                package_metrics["packages"][package]["repository"] = repo
+            repo_metrics = repositories_metrics.get(repo) if repo else None
+            if repo_metrics is not None:
+                repo_metrics["repository"] = repo
+                packages_metrics[package] = repo_metrics
             else:
-                package_metrics["packages"][package] = {"metrics": None}
+                packages_metrics[package] = {"metrics": None}
 
-        output.write(json.dumps(package_metrics, indent=4))
+        json.dump(package_metrics, output, indent=4)
     except SPDXParsingError as e:
         logging.error(e.messages[0])
         sys.exit(1)
@@ -158,11 +204,14 @@ def trustable_grimoirelab_score(
 
 
 def get_repository(download_location: str) -> str | None:
-    if is_valid(download_location):
-        git_regex = re.search(GIT_REPO_REGEX, download_location)
-        if git_regex:
-            uri = f"https://{git_regex.group(5)}"
-            return uri
+    if not is_valid(download_location):
+        return None
+
+    git_regex = _GIT_REPO_RE.search(download_location)
+    if git_regex:
+        return f"https://{git_regex.group('repository')}"
+
+    return None
 
 
 def get_sbom_packages(file: str) -> dict[str, str]:
@@ -172,6 +221,8 @@ def get_sbom_packages(file: str) -> dict[str, str]:
 
     :return: Dict with package and repositories.
     """
+    from spdx_tools.spdx.parser.parse_anything import parse_file
+
     packages = {}
     document = parse_file(file)
     for package in document.packages:
@@ -185,38 +236,72 @@ def get_sbom_packages(file: str) -> dict[str, str]:
     return packages
 
 
-def schedule_repositories(repositories: list[str], grimoirelab_client: GrimoireLabClient) -> None:
+def schedule_repositories(
+    repositories: list[str],
+    grimoirelab_client: GrimoireLabClient,
+    max_workers: int = 16,
+    scheduled: queue.Queue | None = None,
+) -> None:
     """Schedule tasks to collect data from a list of repositories.
 
+    Tasks are scheduled concurrently. If any of them can't be
+    scheduled, the first error found is raised once all the
+    requests have finished.
+
     :param repositories: List of git repositories.
     :param grimoirelab_client: GrimoireLab API client.
+    :param max_workers: Maximum number of concurrent requests.
+    :param scheduled: Queue where repositories are put once their task is scheduled.
     """
     logging.info("Scheduling tasks")
-    for package_url in repositories:
-        logging.debug(f"Scheduling task to fetch commits from {package_url}")
-        try:
-            schedule_repository(grimoirelab_client=grimoirelab_client, uri=package_url, datasource="git", category="commit")
-        except (requests.HTTPError, requests.ConnectionError) as e:
-            logging.error(f"Error scheduling task: {e}")
-            raise e
+
+    errors = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for package_url in repositories:
+            logging.debug(f"Scheduling task to fetch commits from {package_url}")
+            future = executor.submit(
+                schedule_repository, grimoirelab_client=grimoirelab_client, uri=package_url, datasource="git", category="commit"
+            )
+            futures[future] = package_url
+
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except (requests.HTTPError, requests.ConnectionError) as e:
+                logging.error(f"Error scheduling task: {e}")
+                errors.append(e)
+            else:
+                if scheduled is not None:
+                    scheduled.put(futures[future])
+
+    if errors:
+        raise errors[0]
 
 
 def generate_metrics_when_ready(
     grimoirelab_client: GrimoireLabClient,
-    repositories: list[str],
+    scheduled: queue.Queue,
+    scheduling: concurrent.futures.Future,
     opensearch_url: str,
     opensearch_index: str,
     from_date: datetime.datetime | None = None,
     to_date: datetime.datetime | None = None,
     verify_certs: bool = False,
     timeout: int = 3600,
-    code_file_pattern: str | None = None,
-    binary_file_pattern: str | None = None,
+    code_file_pattern: re.Pattern | None = None,
+    binary_file_pattern: re.Pattern | None = None,
+    max_workers: int = 16,
 ) -> dict[str:Any]:
     """Generate metrics once the repositories have finished the collection.
 
+    Repositories are checked as soon as they are put in the `scheduled`
+    queue, while the rest of the tasks are still being scheduled. The
+    timeout starts counting once the scheduling has finished.
+
     :param grimoirelab_client: GrimoireLab API client.
-    :param repositories: List of repositories.
+    :param scheduled: Queue with the repositories whose task is scheduled.
+    :param scheduling: Future of the tasks scheduling.
     :param opensearch_url: OpenSearch URL.
     :param opensearch_index: OpenSearch index.
     :param from_date: Start date for metrics.
@@ -225,39 +310,73 @@ def generate_metrics_when_ready(
     :param timeout: Seconds to wait before failing getting metrics
     :param code_file_pattern: Regular expression to match code file types.
     :param binary_file_pattern: Regular expression to match binary file types.
+    :param max_workers: Maximum number of repositories analyzed concurrently.
     """
     logging.info("Generating metrics")
 
-    limit_time = time.time() + timeout
+    limit_time = None
+    interval = POLLING_MIN_INTERVAL
+
+    get_metrics = functools.partial(
+        get_repository_metrics,
+        opensearch_url=opensearch_url,
+        opensearch_index=opensearch_index,
+        from_date=from_date,
+        to_date=to_date,
+        verify_certs=verify_certs,
+        code_file_pattern=code_file_pattern,
+        binary_file_pattern=binary_file_pattern,
+        pool_maxsize=max_workers,
+    )
 
     after_date = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=7)
-    pending_repositories = set(repositories)
+    pending_repositories = []
     metrics = {"repositories": {}}
 
-    while pending_repositories:
-        processed = set()
-        for repository in pending_repositories:
-            if repository_ready(grimoirelab_client, repository, after_date):
-                metrics["repositories"][repository] = get_repository_metrics(
-                    repository=repository,
-                    opensearch_url=opensearch_url,
-                    opensearch_index=opensearch_index,
-                    from_date=from_date,
-                    to_date=to_date,
-                    verify_certs=verify_certs,
-                    code_file_pattern=code_file_pattern,
-                    binary_file_pattern=binary_file_pattern,
-                )
-                processed.add(repository)
-
-        pending_repositories -= processed
-
-        if pending_repositories and time.time() < limit_time:
+    while True:
+        scheduling_done = scheduling.done()
+        while not scheduled.empty():
+            pending_repositories.append(scheduled.get())
+
+        if scheduling_done and limit_time is None:
+            # Raise the error found scheduling the tasks, if any
+            scheduling.result()
+            limit_time = time.monotonic() + timeout
+
+        if pending_repositories:
+            tasks = get_repositories_tasks(grimoirelab_client, pending_repositories, max_workers)
+            ready = []
+            remaining = []
+            for repository in pending_repositories:
+                task = tasks.get(repository)
+                if task and repository_ready(task, repository, after_date):
+                    ready.append(repository)
+                else:
+                    remaining.append(repository)
+            pending_repositories = remaining
+
+            if ready:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(ready))) as executor:
+                    results = executor.map(get_metrics, ready)
+                    metrics["repositories"].update(zip(ready, results))
+
+                # Poll quickly while repositories are finishing and back off otherwise
+                interval = POLLING_MIN_INTERVAL
+
+        if scheduling_done and (not pending_repositories or time.monotonic() >= limit_time):
+            break
+
+        if pending_repositories:
             logging.info(f"Waiting for {len(pending_repositories)} repositories to be ready")
             logging.debug(f"Repositories not ready: {pending_repositories}")
-            time.sleep(25)
+
+        delay = interval * random.uniform(0.9, 1.1)
+        if scheduling_done:
+            time.sleep(max(min(delay, limit_time - time.monotonic()), 0))
+            interval = min(interval * POLLING_BACKOFF_FACTOR, POLLING_MAX_INTERVAL)
         else:
-            break
+            # Stop waiting as soon as all the tasks are scheduled
+            concurrent.futures.wait([scheduling], timeout=delay)
 
     for repository in pending_repositories:
         logging.warning(f"Timeout waiting for repository {repository} to be ready")
@@ -265,23 +384,57 @@ def generate_metrics_when_ready(
     return metrics
 
 
-def repository_ready(grimoirelab_client: GrimoireLabClient, repository: str, after_date: datetime.datetime) -> bool:
-    """
-    Check if the task related to the repository has finished.
+def get_repositories_tasks(
+    grimoirelab_client: GrimoireLabClient,
+    repositories: Iterable[str],
+    max_workers: int = 16,
+) -> dict[str, dict]:
+    """Get the collection task of each repository.
+
+    The status of the repositories is fetched concurrently, before
+    checking whether any of them is ready. Repositories whose status
+    could not be retrieved are not included in the result.
 
     :param grimoirelab_client: GrimoireLab API client.
-    :param repository: Repository URI
-    :param after_date: Date to check if the task has finished
+    :param repositories: Repositories URIs.
+    :param max_workers: Maximum number of concurrent requests.
+
+    :return: Dict with the task of each repository.
     """
-    try:
+    repositories = list(repositories)
+    if not repositories:
+        return {}
+
+    def get_status(repository: str) -> requests.Response:
         r = grimoirelab_client.get("/datasources/repositories/", params={"uri": repository})
-    except requests.HTTPError as e:
-        logging.warning(f"Error checking repository status: {e}")
-        return False
+        r.raise_for_status()
+        return r
+
+    tasks = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(repositories))) as executor:
+        futures = {executor.submit(get_status, repository): repository for repository in repositories}
 
-    repo_data = r.json()
+        for future, repository in futures.items():
+            try:
+                r = future.result()
+            except requests.HTTPError as e:
+                logging.warning(f"Error checking repository status: {e}")
+                continue
 
-    task = repo_data["results"][0]["task"]
+            repo_data = r.json()
+            tasks[repository] = repo_data["results"][0]["task"]
+
+    return tasks
+
+
+def repository_ready(task: dict, repository: str, after_date: datetime.datetime) -> bool:
+    """
+    Check if the task related to the repository has finished.
+
+    :param task: Collection task of the repository.
+    :param repository: Repository URI
+    :param after_date: Date to check if the task has finished
+    """
     if task["status"] == "failed":
         logging.warning(f"Metrics for '{repository}' might be incomplete")
         return True
@@ -295,7 +448,16 @@ def repository_ready(grimoirelab_client: GrimoireLabClient, repository: str, aft
 def is_valid(repository: str) -> bool:
     """Check that the value is not empty nor invalid."""
 
-    return repository and not isinstance(repository, SpdxNone) and not isinstance(repository, SpdxNoAssertion)
+    return bool(repository) and not isinstance(repository, _spdx_sentinels())
+
+
+@functools.cache
+def _spdx_sentinels() -> tuple[type, ...]:
+    """Return the SPDX classes used for NONE and NOASSERTION values."""
+
+    from spdx_tools.spdx.model import SpdxNone, SpdxNoAssertion
+
+    return SpdxNone, SpdxNoAssertion
 
 
 def schedule_repository(grimoirelab_client: GrimoireLabClient, uri: str, datasource: str, category: str) -> Any:
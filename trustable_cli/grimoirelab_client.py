@@ -17,35 +17,52 @@
 #
 
 import logging
+import threading
 import time
 
 import requests
 
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
 
 MAX_RETRIES = 5
+POOL_MAXSIZE = 10
+STATUS_RETRIES = 3
+STATUS_RETRIES_BACKOFF_FACTOR = 0.5
+STATUS_FORCELIST = [502, 503, 504]
+AUTH_ERROR_STATUS = (401, 403)
+TOKEN_REFRESH_URI = "token/refresh/"
 
 
 class GrimoireLabClient:
     """
     Client to interact with GrimoireLab API.
 
+    The client can be shared by several threads. Refreshing the
+    token and reconnecting are done by one thread at a time.
+
     :param url: GrimoireLab API URL.
     :param user: Username to use when authentication is required.
     :param password: Password to use when authentication is required.
+    :param pool_maxsize: Maximum number of connections kept open with the server.
     """
 
-    def __init__(self, url: str, user: str = None, password: str = None):
+    def __init__(self, url: str, user: str = None, password: str = None, pool_maxsize: int = POOL_MAXSIZE):
         self.url = url
         self.user = user
         self.password = password
+        self.pool_maxsize = pool_maxsize
         self.session = None
         self._token = None
         self._refresh_token = None
+        # Reentrant: the token refresh request might need to reconnect
+        self._lock = threading.RLock()
 
     def connect(self):
         """Establish a connection to the server, and create a token"""
 
-        self.session = requests.Session()
+        self.session = self._create_session()
         if not (self.user and self.password):
             return
 
@@ -59,14 +76,47 @@ class GrimoireLabClient:
 
         self.session.headers.update({"Authorization": f"Bearer {self._token}"})
 
-    def _reconnect(self):
-        """Reconnect to the server using a new Session and the current token"""
+    def _reconnect(self, failed_session: requests.Session):
+        """Reconnect to the server using a new Session and the current token
 
-        logging.debug("Server closed the connection. Reconnecting to the server.")
+        :param failed_session: Session that could not connect to the server.
+        """
+        with self._lock:
+            if self.session is not failed_session:
+                # Another thread already reconnected
+                return
 
-        self.session = requests.Session()
-        if self._token:
-            self.session.headers.update({"Authorization": f"Bearer {self._token}"})
+            logging.debug("Server closed the connection. Reconnecting to the server.")
+
+            session = self._create_session()
+            if self._token:
+                session.headers.update({"Authorization": f"Bearer {self._token}"})
+            self.session = session
+
+    def _create_session(self) -> requests.Session:
+        """Create a session that keeps alive connections to the server.
+
+        Requests failing with a transient server error are retried
+        by the adapter. Connection errors are handled by `_make_request`.
+        """
+        retries = Retry(
+            total=None,
+            connect=0,
+            read=False,
+            other=0,
+            status=STATUS_RETRIES,
+            status_forcelist=STATUS_FORCELIST,
+            allowed_methods=["GET", "POST"],
+            backoff_factor=STATUS_RETRIES_BACKOFF_FACTOR,
+            raise_on_status=False,
+        )
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.pool_maxsize, max_retries=retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
 
     def get(self, uri: str, *args, **kwargs) -> requests.Response:
         """
@@ -91,6 +141,9 @@ class GrimoireLabClient:
         Make a request to the GrimoireLab API with retry and exponential backoff.
         If the session is invalid or the token is expired, it attempts to reconnect and retry.
 
+        The response is returned even when its status is an error;
+        callers are in charge of checking it.
+
         :param method: HTTP method to use (get or post).
         :param uri: URI to request.
         """
@@ -99,18 +152,22 @@ class GrimoireLabClient:
 
         url = f"{self.url}/{uri}"
         last_exception = None
+        # Refreshing the token when the refresh itself fails would never end
+        can_refresh = uri != TOKEN_REFRESH_URI
 
         for attempt in range(MAX_RETRIES):
+            session = self.session
+            token = self._token
             try:
-                response = self.session.request(method, url, *args, **kwargs)
-                response.raise_for_status()
+                response = session.request(method, url, *args, **kwargs)
+                if response.status_code in AUTH_ERROR_STATUS and self._refresh_token and can_refresh:
+                    # Repeat the request once with a new token
+                    self._refresh_auth_token(token)
+                    can_refresh = False
+                    response = self.session.request(method, url, *args, **kwargs)
                 return response
-            except requests.HTTPError as e:
-                if e.response.status_code == 403 and self._refresh_token:
-                    self._refresh_auth_token()
-                return e.response
             except (requests.ConnectionError, requests.Timeout) as e:
-                self._reconnect()
+                self._reconnect(session)
                 last_exception = e
 
             delay = 2**attempt
@@ -120,16 +177,23 @@ class GrimoireLabClient:
         if last_exception:
             raise last_exception
 
-    def _refresh_auth_token(self):
-        """Refresh the access token using the refresh token"""
+    def _refresh_auth_token(self, expired_token: str):
+        """Refresh the access token using the refresh token
 
-        logging.debug("Refreshing token...")
+        :param expired_token: Token rejected by the server.
+        """
+        with self._lock:
+            if self._token != expired_token:
+                # Another thread already refreshed it
+                return
 
-        credentials = {"refresh": self._refresh_token}
-        response = self.post("token/refresh/", json=credentials)
-        response.raise_for_status()
-        data = response.json()
+            logging.debug("Refreshing token...")
 
-        self._token = data.get("access")
+            credentials = {"refresh": self._refresh_token}
+            response = self.post(TOKEN_REFRESH_URI, json=credentials)
+            response.raise_for_status()
+            data = response.json()
 
-        self.session.headers.update({"Authorization": f"Bearer {self._token}"})
+            self._token = data.get("access")
+
+            self.session.headers.update({"Authorization": f"Bearer {self._token}"})
@@ -21,59 +21,91 @@ from __future__ import annotations
 import datetime
 import logging
 import re
+import threading
 import typing
 
 from collections import Counter
 
-import certifi
-
-from opensearchpy import OpenSearch, Search
-
 
 logging.getLogger("opensearch").setLevel(logging.WARNING)
 
 
 if typing.TYPE_CHECKING:
+    from collections.abc import Callable
     from typing import Any
 
+    from opensearchpy import OpenSearch
+
 
 COMMIT_EVENT_TYPE = "org.grimoirelab.events.git.commit"
 AUTHOR_FIELD = "Author"
-FILE_TYPE_CODE = (
-    r"\.bazel$|\.bazelrc$|\.bzl$|\.c$|\.cc$|\.cp$|\.cpp$|\.cs$\|\.cxx$|\.c\+\+$|"
-    r"\.go$|\.h$|\.hpp$|\.js$|\.mjs$|\.java$|\.pl$|\.py$|\.rs$|\.sh$|\.tf$|\.ts$"
+EVENT_FIELDS = [
+    f"data.{AUTHOR_FIELD}",
+    "data.files.file",
+    "data.files.added",
+    "data.files.removed",
+    "data.message",
+]
+SCAN_BATCH_SIZE = 5000
+FILE_TYPE_CODE_EXTENSIONS = frozenset(
+    ".bazel .bazelrc .bzl .c .cc .cp .cpp .cs .cxx .c++ .go .h .hpp .js .mjs .java .pl .py .rs .sh .tf .ts".split()
 )
-FILE_TYPE_BINARY = (
-    r"\.7z$|\.a$|\.abb$|\.apk$|\.app$|\.appx$|\.arc$|\.bin$|\.bz2$|\.class$|\.deb$|"
-    r"\.dll$|\.dmg$|\.exe$|\.gz$|\.ipa$|\.iso$|\.jar$|\.lib$|\.msi$|\.o$|\.obj$|\.rar$|"
-    r"\.rpm$|\.so$|\.tar$|\.xar$|\.xz$|\.zip$|\.zst$|\.Z$"
+FILE_TYPE_BINARY_EXTENSIONS = frozenset(
+    (
+        ".7z .a .abb .apk .app .appx .arc .bin .bz2 .class .deb .dll .dmg .exe .gz .ipa .iso .jar .lib .msi "
+        ".o .obj .rar .rpm .so .tar .xar .xz .zip .zst .Z"
+    ).split()
 )
 
+# OpenSearch connections shared by all the threads, by connection parameters
+_opensearch_connections: dict[tuple, OpenSearch] = {}
+_opensearch_connections_lock = threading.Lock()
+
 
 class GitEventsAnalyzer:
-    def __init__(self, code_file_pattern: str | None = None, binary_file_pattern: str | None = None):
+    def __init__(
+        self,
+        code_file_pattern: str | re.Pattern | None = None,
+        binary_file_pattern: str | re.Pattern | None = None,
+    ):
         self.total_commits: int = 0
         self.contributors: Counter = Counter()
+        self._sorted_contributions: list[int] | None = None
         self.companies: Counter = Counter()
         self.file_types: dict = {"code": 0, "binary": 0, "other": 0}
         self.added_lines: int = 0
         self.removed_lines: int = 0
-        self.messages_sizes: list = []
-        self.re_code_pattern = re.compile(code_file_pattern or FILE_TYPE_CODE)
-        self.re_binary_pattern = re.compile(binary_file_pattern or FILE_TYPE_BINARY)
+        self.messages_sizes: Counter = Counter()
+        self.messages_total: int = 0
+        self.is_code_file = _file_type_matcher(code_file_pattern, FILE_TYPE_CODE_EXTENSIONS)
+        self.is_binary_file = _file_type_matcher(binary_file_pattern, FILE_TYPE_BINARY_EXTENSIONS)
 
     def process_events(self, events: iter(dict[str, Any])):
-        for event in events:
-            if event["type"] != COMMIT_EVENT_TYPE:
-                continue
+        """
+        Update the metrics with a set of commit events.
 
+        Events of other types must be filtered out before, as
+        `get_repository_events` does in the query.
+
+        :param events: Commit events
+        """
+        # New contributions invalidate the sorted ones
+        self._sorted_contributions = None
+
+        # Look up attributes once instead of once per event
+        contributors = self.contributors
+        update_companies = self._update_companies
+        update_file_metrics = self._update_file_metrics
+        update_message_size_metrics = self._update_message_size_metrics
+
+        for event in events:
             event_data = event.get("data")
 
             self.total_commits += 1
-            self.contributors[event_data[AUTHOR_FIELD]] += 1
-            self._update_companies(event_data)
-            self._update_file_metrics(event_data)
-            self._update_message_size_metrics(event_data)
+            contributors[event_data[AUTHOR_FIELD]] += 1
+            update_companies(event_data)
+            update_file_metrics(event_data)
+            update_message_size_metrics(event_data)
 
     def get_commit_count(self):
         return self.total_commits
@@ -86,14 +118,15 @@ class GitEventsAnalyzer:
 
         partial_contributions = 0
         pony_factor = 0
+        total_commits = self.total_commits
 
         if len(self.contributors) == 0:
             return 0
 
-        for _, contributions in self.contributors.most_common():
+        for contributions in self._get_sorted_contributions():
             partial_contributions += contributions
             pony_factor += 1
-            if partial_contributions / self.total_commits > 0.5:
+            if partial_contributions * 2 > total_commits:
                 break
 
         return pony_factor
@@ -103,6 +136,7 @@ class GitEventsAnalyzer:
 
         partial_contributions = 0
         elephant_factor = 0
+        total_commits = self.total_commits
 
         if len(self.companies) == 0:
             return 0
@@ -110,7 +144,7 @@ class GitEventsAnalyzer:
         for _, contributions in self.companies.most_common():
             partial_contributions += contributions
             elephant_factor += 1
-            if partial_contributions / self.total_commits > 0.5:
+            if partial_contributions * 2 > total_commits:
                 break
 
         return elephant_factor
@@ -132,13 +166,13 @@ class GitEventsAnalyzer:
     def get_message_size_metrics(self):
         """Get the message size metrics"""
 
-        total = sum(self.messages_sizes)
-        number = len(self.messages_sizes)
+        total = self.messages_total
+        number = self.messages_sizes.total()
         mean = 0
         median = 0
         if number > 0:
             mean = total / number
-            median = sorted(self.messages_sizes)[number // 2]
+            median = self._get_message_size_median(number)
 
         metrics = {
             "total": total,
@@ -147,6 +181,16 @@ class GitEventsAnalyzer:
         }
         return metrics
 
+    def _get_message_size_median(self, number: int) -> int:
+        """Return the size in the middle of the sorted message sizes"""
+
+        middle = number // 2
+        acc_sizes = 0
+        for size, count in sorted(self.messages_sizes.items()):
+            acc_sizes += count
+            if acc_sizes > middle:
+                return size
+
     def get_commit_frequency_metrics(self, days_interval: int):
         """
         Get the average (mean) number of commits per week, month and
@@ -177,7 +221,7 @@ class GitEventsAnalyzer:
         casual_threshold = int(0.95 * self.total_commits)
         acc_commits = 0
 
-        for _, contributions in self.contributors.most_common():
+        for contributions in self._get_sorted_contributions():
             acc_commits += contributions
 
             if acc_commits <= regular_threshold:
@@ -193,28 +237,46 @@ class GitEventsAnalyzer:
             "casual": casual,
         }
 
+    def _get_sorted_contributions(self) -> list[int]:
+        """Return the contributions of each contributor, from highest to lowest"""
+
+        if self._sorted_contributions is None:
+            self._sorted_contributions = sorted(self.contributors.values(), reverse=True)
+
+        return self._sorted_contributions
+
     def _update_companies(self, event):
-        try:
-            author = event[AUTHOR_FIELD]
-            company = author.split("@")[1][:-1]
-            self.companies[company] += 1
-        except (IndexError, KeyError):
-            pass
+        author = event.get(AUTHOR_FIELD)
+        if not author:
+            return
+
+        # Authors are formatted as 'Name <user@domain>'
+        start = author.rfind("@") + 1
+        if start == 0:
+            return
+
+        end = -1 if author.endswith(">") else len(author)
+        self.companies[author[start:end]] += 1
 
     def _update_file_metrics(self, event):
         if "files" not in event:
             return
 
+        file_types = self.file_types
+        is_code_file = self.is_code_file
+        is_binary_file = self.is_binary_file
+
         for file in event["files"]:
-            if not file["file"]:
+            filename = file["file"]
+            if not filename:
                 continue
             # File type metrics
-            if self.re_code_pattern.search(file["file"]):
-                self.file_types["code"] += 1
-            elif self.re_binary_pattern.search(file["file"]):
-                self.file_types["binary"] += 1
+            if is_code_file(filename):
+                file_types["code"] += 1
+            elif is_binary_file(filename):
+                file_types["binary"] += 1
             else:
-                self.file_types["other"] += 1
+                file_types["other"] += 1
 
             # Line added/removed metrics
             if "added" in file:
@@ -229,8 +291,9 @@ class GitEventsAnalyzer:
                     pass
 
     def _update_message_size_metrics(self, event):
-        message = event.get("message", "")
-        self.messages_sizes.append(len(message))
+        size = len(event.get("message", ""))
+        self.messages_sizes[size] += 1
+        self.messages_total += size
 
 
 def get_repository_metrics(
@@ -240,8 +303,9 @@ def get_repository_metrics(
     from_date: datetime.datetime = None,
     to_date: datetime.datetime = None,
     verify_certs: bool = True,
-    code_file_pattern: str | None = None,
-    binary_file_pattern: str | None = None,
+    code_file_pattern: str | re.Pattern | None = None,
+    binary_file_pattern: str | re.Pattern | None = None,
+    pool_maxsize: int | None = None,
 ):
     """
     Get the metrics from a repository.
@@ -254,8 +318,9 @@ def get_repository_metrics(
     :param to_date: End date, by default None
     :param code_file_pattern: Regular expression to match code file types.
     :param binary_file_pattern: Regular expression to match binary file types.
+    :param pool_maxsize: Maximum number of connections kept open with OpenSearch
     """
-    os_conn = connect_to_opensearch(opensearch_url, verify_certs=verify_certs)
+    os_conn = connect_to_opensearch(opensearch_url, verify_certs=verify_certs, pool_maxsize=pool_maxsize)
 
     metrics = {"metrics": {}}
 
@@ -306,12 +371,19 @@ def get_repository_events(
     :param from_date: Start date, by default None
     :param to_date: End date, by default None
     """
+    from opensearchpy import Search
+
     s = Search(using=connection, index=index_name).filter("match", source=repository).filter("term", type=COMMIT_EVENT_TYPE)
+    # Only fetch the fields used to calculate the metrics
+    s = s.source(EVENT_FIELDS)
 
     date_range = _format_date(from_date, to_date)
     if date_range:
         s = s.filter("range", time=date_range)
 
+    # Larger batches need fewer scroll requests; the order of the events is not relevant
+    s = s.params(size=SCAN_BATCH_SIZE, preserve_order=False)
+
     return s.scan()
 
 
@@ -319,30 +391,73 @@ def connect_to_opensearch(
     url: str,
     verify_certs: bool = True,
     max_retries: int = 3,
+    pool_maxsize: int | None = None,
 ) -> OpenSearch:
     """
     Connect to an OpenSearch instance using the given parameters.
 
+    The connection is shared by all the calls with the same
+    parameters, including calls from different threads, so its
+    connection pool is reused between them. OpenSearch clients
+    are thread safe; the lock only avoids creating the same
+    connection twice.
+
     :param url: URL of the OpenSearch instance
     :param verify_certs: Boolean, verify SSL/TLS certificates
     :param max_retries: Maximum number of retries in case of timeout
+    :param pool_maxsize: Maximum number of connections kept open,
+        by default the client's one
 
     :return: OpenSearch connection
     """
-    os_conn = OpenSearch(
-        hosts=[url],
-        http_compress=True,
-        verify_certs=verify_certs,
-        ssl_assert_hostname=False,
-        ssl_show_warn=False,
-        ca_cert=certifi.where,
-        max_retries=max_retries,
-        retry_on_timeout=True,
-    )
+    key = (url, verify_certs, max_retries, pool_maxsize)
+
+    with _opensearch_connections_lock:
+        os_conn = _opensearch_connections.get(key)
+        if os_conn is not None:
+            return os_conn
+
+        # opensearch-py is slow to import; load it only when metrics are calculated
+        import certifi
+
+        from opensearchpy import OpenSearch
+
+        os_conn = OpenSearch(
+            hosts=[url],
+            http_compress=True,
+            verify_certs=verify_certs,
+            ssl_assert_hostname=False,
+            ssl_show_warn=False,
+            ca_cert=certifi.where,
+            max_retries=max_retries,
+            retry_on_timeout=True,
+            pool_maxsize=pool_maxsize,
+        )
+        _opensearch_connections[key] = os_conn
 
     return os_conn
 
 
+def _file_type_matcher(pattern: str | re.Pattern | None, extensions: frozenset[str]) -> Callable[[str], Any]:
+    """
+    Return a function that checks if a file name is of a type.
+
+    Custom patterns are matched as regular expressions. By default,
+    the extension of the file is looked up in the set of extensions.
+
+    :param pattern: Regular expression to match the file type, if any
+    :param extensions: Extensions of the file type used by default
+    """
+    if pattern:
+        return re.compile(pattern).search
+
+    def has_extension(filename: str) -> bool:
+        dot = filename.rfind(".")
+        return dot != -1 and filename[dot:] in extensions
+
+    return has_extension
+
+
 def _format_date(from_date: datetime.datetime, to_date: datetime.datetime) -> dict:
     """
     Format the date range for the OpenSearch query.